@@ -2,12 +2,17 @@
 Flask backend API for AI Micro Break System
 """
 
+import functools
+import gzip
+import hashlib
 import logging
+import mimetypes
 import os
 import threading
 import time
 import signal
 import atexit
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, date
 from flask import Flask, request, jsonify, send_from_directory
 from flask_cors import CORS
@@ -26,6 +31,13 @@ from modules.break_recommendation import get_break_recommender
 from modules.personalization import get_personalization_engine
 from modules.productivity_analytics import get_productivity_analytics
 
+# Config values referenced per request or in the __main__ block, bound once
+# so endpoints avoid repeated dict lookups
+_VERSION = APP_CONFIG['version']
+_PORT = APP_CONFIG['port']
+_DEBUG = APP_CONFIG['debug']
+_LOG_DIR = LOGGING_CONFIG['log_dir']
+
 # Configure logging
 logging.basicConfig(
     level=getattr(logging, LOGGING_CONFIG['log_level']),
@@ -43,6 +55,47 @@ app = Flask(__name__)
 app.config['SECRET_KEY'] = APP_CONFIG['secret_key']
 CORS(app)
 
+# Use orjson for response serialization when available (C-implemented,
+# several times faster than stdlib json on the small dicts we return)
+try:
+    import orjson
+    from flask.json.provider import DefaultJSONProvider, JSONProvider
+
+    class OrjsonProvider(JSONProvider):
+        """JSON provider backed by orjson for faster jsonify responses"""
+
+        def dumps(self, obj, **kwargs):
+            # Delegate unknown types to Flask's default handler: MySQL
+            # returns decimal.Decimal for SUM()/AVG() aggregates, which
+            # orjson refuses to serialize on its own
+            return orjson.dumps(
+                obj,
+                default=DefaultJSONProvider.default,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+            ).decode('utf-8')
+
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+
+    app.json = OrjsonProvider(app)
+    logger.info("orjson JSON provider enabled")
+except ImportError:
+    logger.info("orjson not installed - using default JSON provider")
+
+def api_route(path, **route_kwargs):
+    """app.route plus the shared error handler, so endpoints only carry their
+    success path instead of repeating try/except/log/500 boilerplate"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                logger.error(f"Error in {fn.__name__}: {e}")
+                return jsonify({'error': str(e)}), 500
+        return app.route(path, **route_kwargs)(wrapper)
+    return decorator
+
 # Initialize managers
 db_manager = get_database_manager()
 data_service = get_data_service()
@@ -57,6 +110,81 @@ productivity_analytics = get_productivity_analytics()
 monitor_thread_running = False
 monitor_thread = None
 
+# Cached second-resolution ISO timestamp (avoids datetime.now() per response).
+# Stored as an immutable tuple swapped in one assignment, so readers never
+# need a lock - they either see the old pair or the new pair.
+_ts_cache = (0, '')
+
+def iso_now() -> str:
+    """Return the current local time as an ISO string, cached per second"""
+    global _ts_cache
+    seconds = int(time.time())
+    cached_seconds, cached_iso = _ts_cache
+    if seconds != cached_seconds:
+        cached_iso = datetime.fromtimestamp(seconds).isoformat()
+        _ts_cache = (seconds, cached_iso)
+    return cached_iso
+
+# Background executor for DB writes that don't need to block the response
+_db_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='db-writer')
+
+# Sub-second snapshot caches so back-to-back dashboard polls of different
+# endpoints share one lock-protected read of the monitor modules
+_snapshot_cache = {}
+_snapshot_lock = threading.Lock()
+
+def _cached_snapshot(name, fetch, ttl: float = 0.5):
+    """Return fetch() memoized within a `ttl`-second bucket"""
+    bucket = int(time.monotonic() / ttl)
+    with _snapshot_lock:
+        cached = _snapshot_cache.get(name)
+        if cached and cached[0] == bucket:
+            return cached[1]
+    value = fetch()
+    with _snapshot_lock:
+        _snapshot_cache[name] = (bucket, value)
+    return value
+
+def get_activity_snapshot():
+    """Activity summary shared across endpoints within a 500ms window"""
+    # Copied before the cache retains it: the monitor rebuilds its summary
+    # buffer in place, which would tear responses serialized mid-rebuild
+    return _cached_snapshot(
+        'activity', lambda: dict(activity_monitor.get_activity_summary()))
+
+def get_fatigue_snapshot():
+    """Fatigue status shared across endpoints within a 500ms window"""
+    return _cached_snapshot('fatigue', fatigue_detector.get_fatigue_status)
+
+# Cached database health probe (avoids a DB round-trip per dashboard poll)
+_health_cache = {'ts': 0.0, 'ok': False}
+_health_cache_lock = threading.Lock()
+
+def cached_db_health(ttl: float = 2.0) -> bool:
+    """Return the last health_check() result, re-probing at most every `ttl` seconds"""
+    now = time.monotonic()
+    with _health_cache_lock:
+        if now - _health_cache['ts'] < ttl:
+            return _health_cache['ok']
+    # Probe outside the lock so slow checks don't block other requests
+    ok = db_manager.health_check()
+    with _health_cache_lock:
+        _health_cache['ts'] = time.monotonic()
+        _health_cache['ok'] = ok
+    return ok
+
+def _log_and_track_break(user_id: int, break_record: dict, duration: int):
+    """Log an enforced break and mark it completed once its duration elapses"""
+    break_id = data_service.log_break(user_id, break_record)
+
+    # Update break status to completed once it's done (simple async-like update)
+    def mark_break_complete(b_id):
+        time.sleep(duration * 60)
+        data_service.update_break_compliance(b_id, 'Completed')
+
+    if isinstance(break_id, int):
+        threading.Thread(target=mark_break_complete, args=(break_id,), daemon=True).start()
+
 def system_monitor_loop():
     """Background task to bridge modules and log data periodically"""
     global monitor_thread_running
@@ -86,10 +214,12 @@ def system_monitor_loop():
                     data_service.log_activity(user_id, activity_summary)
                     data_service.log_fatigue(user_id, fatigue_status)
                     
-                    # Update local metrics for productivity calculations
+                    # Update local metrics for productivity calculations;
+                    # copied because sessions retain the dict and the
+                    # monitor rebuilds its summary buffer in place
                     productivity_analytics.record_productivity_session(user_id, {
                         'duration': log_interval,
-                        'activity_summary': activity_summary
+                        'activity_summary': dict(activity_summary)
                     })
                     
                     # Sync to database for analytics dashboard
@@ -105,12 +235,27 @@ def system_monitor_loop():
             logger.error(f"Error in background monitoring loop: {e}")
             time.sleep(30) # Back off on error
 
+def retention_purge_loop():
+    """Daily purge of log rows older than the retention window
+
+    Keeps ActivityLog/FatigueDetection index ranges bounded so the
+    recent-window queries stay fast as history accumulates.
+    """
+    retention_days = int(os.environ.get('LOG_RETENTION_DAYS', 30))
+    while True:
+        try:
+            db_manager.purge_old_logs(retention_days)
+        except Exception as e:
+            logger.error(f"Error in retention purge: {e}")
+        time.sleep(24 * 3600)
+
 def start_background_task():
     global monitor_thread_running, monitor_thread
     if not monitor_thread_running:
         monitor_thread_running = True
         monitor_thread = threading.Thread(target=system_monitor_loop, daemon=True)
         monitor_thread.start()
+        threading.Thread(target=retention_purge_loop, daemon=True).start()
 
 # ==================== HEALTH CHECK ====================
 
@@ -118,31 +263,29 @@ def start_background_task():
 def health_check():
     """Comprehensive health check endpoint"""
     try:
-        # Check database health
-        db_healthy = db_manager.health_check()
-        
+        # Check database health (cached with short TTL to survive dashboard polling)
+        db_healthy = cached_db_health()
+        am_ok = activity_monitor is not None
+        fd_ok = fatigue_detector is not None
+        ds_ok = data_service is not None
+
+        # Overall health via short-circuit boolean chain
+        overall_healthy = db_healthy and am_ok and fd_ok and ds_ok
+
         # Check component status
         components_status = {
             'database': db_healthy,
-            'activity_monitor': activity_monitor is not None,
-            'fatigue_detector': fatigue_detector is not None,
-            'data_service': data_service is not None,
-            'monitoring_active': activity_monitor.is_monitoring if activity_monitor else False,
-            'detection_active': fatigue_detector.is_running if fatigue_detector else False
+            'activity_monitor': am_ok,
+            'fatigue_detector': fd_ok,
+            'data_service': ds_ok,
+            'monitoring_active': activity_monitor.is_monitoring if am_ok else False,
+            'detection_active': fatigue_detector.is_running if fd_ok else False
         }
         
-        # Overall health
-        overall_healthy = all([
-            components_status['database'],
-            components_status['activity_monitor'],
-            components_status['fatigue_detector'],
-            components_status['data_service']
-        ])
-        
         return jsonify({
             'status': 'healthy' if overall_healthy else 'degraded',
-            'timestamp': datetime.now().isoformat(),
-            'version': APP_CONFIG['version'],
+            'timestamp': iso_now(),
+            'version': _VERSION,
             'components': components_status
         }), 200
         
@@ -150,158 +293,144 @@ def health_check():
         logger.error(f"Health check error: {e}")
         return jsonify({
             'status': 'unhealthy',
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': iso_now(),
             'error': str(e)
         }), 500
 
 # ==================== USER MANAGEMENT ====================
 
-@app.route('/api/v1/users/register', methods=['POST'])
+@api_route('/api/v1/users/register', methods=['POST'])
 def register_user():
     """Register new user"""
-    try:
-        data = request.get_json()
-        if not data:
-            return jsonify({'error': 'JSON body required'}), 400
-            
-        username = data.get('username')
-        email = data.get('email')
-        password = data.get('password')
+    data = request.get_json(silent=True, cache=True)
+    if not data:
+        return jsonify({'error': 'JSON body required'}), 400
         
-        if not all([username, email, password]):
-            return jsonify({'error': 'Missing required fields'}), 400
+    username = data.get('username')
+    email = data.get('email')
+    password = data.get('password')
+    
+    if not (username and email and password):
+        return jsonify({'error': 'Missing required fields'}), 400
+    
+    # Hash password (in production, use proper hashing)
+    password_hash = password  # TODO: Use bcrypt
+    
+    if db_manager.create_user(username, email, password_hash):
+        # Create user profile
+        personalization_engine.create_user_profile(1, {
+            'preferred_break_types': data.get('preferred_break_types', ['eye_exercise', 'stretching'])
+        })
         
-        # Hash password (in production, use proper hashing)
-        password_hash = password  # TODO: Use bcrypt
+        return jsonify({
+            'message': 'User registered successfully',
+            'username': username
+        }), 201
+    else:
+        return jsonify({'error': 'Registration failed'}), 500
         
-        if db_manager.create_user(username, email, password_hash):
-            # Create user profile
-            personalization_engine.create_user_profile(1, {
-                'preferred_break_types': data.get('preferred_break_types', ['eye_exercise', 'stretching'])
-            })
-            
-            return jsonify({
-                'message': 'User registered successfully',
-                'username': username
-            }), 201
-        else:
-            return jsonify({'error': 'Registration failed'}), 500
-            
-    except Exception as e:
-        logger.error(f"Registration error: {e}")
-        return jsonify({'error': str(e)}), 500
 
 # ==================== MONITORING STATUS ====================
 
-@app.route('/api/v1/monitoring/status', methods=['GET'])
+@api_route('/api/v1/monitoring/status', methods=['GET'])
 def get_monitoring_status():
     """Get current monitoring status"""
-    try:
-        # Get pool stats
-        pool_stats = db_manager.get_pool_stats()
-        
-        return jsonify({
-            'activity_monitoring': activity_monitor.is_monitoring,
-            'fatigue_detection': fatigue_detector.is_running,
-            'database_healthy': db_manager.health_check(),
-            'database_pool': pool_stats,
-            'timestamp': datetime.now().isoformat()
-        }), 200
-    except Exception as e:
-        logger.error(f"Error getting monitoring status: {e}")
-        return jsonify({'error': str(e)}), 500
+    # Get pool stats
+    pool_stats = db_manager.get_pool_stats()
+    
+    return jsonify({
+        'activity_monitoring': activity_monitor.is_monitoring,
+        'fatigue_detection': fatigue_detector.is_running,
+        'database_healthy': cached_db_health(),
+        'database_pool': pool_stats,
+        'timestamp': iso_now()
+    }), 200
 
 # ==================== ACTIVITY MONITORING ====================
 
-@app.route('/api/v1/monitoring/start', methods=['POST'])
+@api_route('/api/v1/monitoring/start', methods=['POST'])
 def start_monitoring():
     """Start activity monitoring with duplicate call prevention"""
-    try:
-        # Get user_id from JSON body or default to 1
-        data = request.get_json() or {}
-        user_id = data.get('user_id', 1)
-        
-        # Check if monitoring is already running
-        if activity_monitor.is_monitoring:
-            logger.warning("Monitoring already started")
-            return jsonify({
-                'message': 'Monitoring already started',
-                'timestamp': datetime.now().isoformat(),
-                'status': 'already_running'
-            }), 200
-        
-        # Start monitoring components
-        activity_started = activity_monitor.start_monitoring()
-        fatigue_started = fatigue_detector.start_detection()
-        
-        if not activity_started or not fatigue_started:
-            # Cleanup if either failed
-            try:
-                activity_monitor.stop_monitoring()
-                fatigue_detector.stop_detection()
-            except Exception as cleanup_error:
-                logger.error(f"Error during startup cleanup: {cleanup_error}")
-            
-            return jsonify({
-                'error': 'Failed to start monitoring components',
-                'activity_started': activity_started,
-                'fatigue_started': fatigue_started
-            }), 500
-        
-        # Log initial state (with error handling)
-        try:
-            activity_summary = activity_monitor.get_activity_summary()
-            data_service.log_activity(user_id, activity_summary)
-        except Exception as log_error:
-            logger.warning(f"Failed to log initial activity: {log_error}")
-        
+    # Get user_id from JSON body or default to 1
+    data = request.get_json(silent=True, cache=True) or {}
+    user_id = data.get('user_id', 1)
+    
+    # Check if monitoring is already running
+    if activity_monitor.is_monitoring:
+        logger.warning("Monitoring already started")
         return jsonify({
-            'message': 'Monitoring started successfully',
-            'timestamp': datetime.now().isoformat(),
-            'user_id': user_id
+            'message': 'Monitoring already started',
+            'timestamp': iso_now(),
+            'status': 'already_running'
         }), 200
+    
+    # Start monitoring components
+    activity_started = activity_monitor.start_monitoring()
+    fatigue_started = fatigue_detector.start_detection()
+    
+    if not activity_started or not fatigue_started:
+        # Cleanup if either failed
+        try:
+            activity_monitor.stop_monitoring()
+            fatigue_detector.stop_detection()
+        except Exception as cleanup_error:
+            logger.error(f"Error during startup cleanup: {cleanup_error}")
         
-    except Exception as e:
-        logger.error(f"Error starting monitoring: {e}")
-        return jsonify({'error': str(e)}), 500
+        return jsonify({
+            'error': 'Failed to start monitoring components',
+            'activity_started': activity_started,
+            'fatigue_started': fatigue_started
+        }), 500
+    
+    # Log initial state off the request path (with error handling); the
+    # summary dict is reused by the monitor, so pass the executor a copy
+    try:
+        activity_summary = activity_monitor.get_activity_summary()
+        _db_executor.submit(data_service.log_activity, user_id, dict(activity_summary))
+    except Exception as log_error:
+        logger.warning(f"Failed to log initial activity: {log_error}")
+    
+    return jsonify({
+        'message': 'Monitoring started successfully',
+        'timestamp': iso_now(),
+        'user_id': user_id
+    }), 200
+    
 
-@app.route('/api/v1/monitoring/stop', methods=['POST'])
+@api_route('/api/v1/monitoring/stop', methods=['POST'])
 def stop_monitoring():
     """Stop activity monitoring with proper cleanup"""
-    try:
-        # Get user_id from JSON body or default to 1
-        data = request.get_json() or {}
-        user_id = data.get('user_id', 1)
-        
-        # Check if monitoring is running
-        if not activity_monitor.is_monitoring:
-            logger.warning("Monitoring not running")
-            return jsonify({
-                'message': 'Monitoring not running',
-                'timestamp': datetime.now().isoformat(),
-                'status': 'already_stopped'
-            }), 200
-        
-        # Log final state before stopping (with error handling)
-        try:
-            activity_summary = activity_monitor.get_activity_summary()
-            data_service.log_activity(user_id, activity_summary)
-        except Exception as log_error:
-            logger.warning(f"Failed to log final activity: {log_error}")
-        
-        # Stop monitoring components
-        activity_monitor.stop_monitoring()
-        fatigue_detector.stop_detection()
-        
+    # Get user_id from JSON body or default to 1
+    data = request.get_json(silent=True, cache=True) or {}
+    user_id = data.get('user_id', 1)
+    
+    # Check if monitoring is running
+    if not activity_monitor.is_monitoring:
+        logger.warning("Monitoring not running")
         return jsonify({
-            'message': 'Monitoring stopped successfully',
-            'timestamp': datetime.now().isoformat(),
-            'user_id': user_id
+            'message': 'Monitoring not running',
+            'timestamp': iso_now(),
+            'status': 'already_stopped'
         }), 200
-        
-    except Exception as e:
-        logger.error(f"Error stopping monitoring: {e}")
-        return jsonify({'error': str(e)}), 500
+    
+    # Log final state before stopping, off the request path (with error
+    # handling); copied for the same reason as the initial log above
+    try:
+        activity_summary = activity_monitor.get_activity_summary()
+        _db_executor.submit(data_service.log_activity, user_id, dict(activity_summary))
+    except Exception as log_error:
+        logger.warning(f"Failed to log final activity: {log_error}")
+    
+    # Stop monitoring components
+    activity_monitor.stop_monitoring()
+    fatigue_detector.stop_detection()
+    
+    return jsonify({
+        'message': 'Monitoring stopped successfully',
+        'timestamp': iso_now(),
+        'user_id': user_id
+    }), 200
+    
 
 @app.route('/api/v1/activity/current', methods=['GET'])
 def get_current_activity():
@@ -311,7 +440,7 @@ def get_current_activity():
         
         # Get REAL-TIME data from activity monitor (not database)
         if activity_monitor and activity_monitor.is_monitoring:
-            activity_data = activity_monitor.get_activity_summary()
+            activity_data = get_activity_snapshot()
             
             return jsonify({
                 'total_mouse_clicks': activity_data.get('mouse_clicks', 0),
@@ -364,7 +493,7 @@ def get_fatigue_status():
         # PRIORITY 1: Get REAL-TIME data from detector if monitoring
         if fatigue_detector and fatigue_detector.is_running:
             try:
-                status = fatigue_detector.get_fatigue_status()
+                status = get_fatigue_snapshot()
                 return jsonify(status), 200
             except Exception as detector_error:
                 logger.debug(f"Error getting fatigue from detector: {detector_error}")
@@ -373,6 +502,9 @@ def get_fatigue_status():
         try:
             latest_fatigue = data_service.get_latest_fatigue(user_id)
             if latest_fatigue:
+                # Timestamp is a datetime from FatigueDetection rows but
+                # already an ISO string from UserCurrentState snapshots
+                ts = latest_fatigue.get('Timestamp')
                 return jsonify({
                     'fatigue_score': latest_fatigue.get('FatigueScore', 0),
                     'eye_strain_level': latest_fatigue.get('EyeStrainLevel', 0),
@@ -380,7 +512,7 @@ def get_fatigue_status():
                     'blink_rate': latest_fatigue.get('BlinkRate', 0),
                     'facial_expression': latest_fatigue.get('FacialExpression', 'neutral'),
                     'alert_generated': latest_fatigue.get('AlertGenerated', False),
-                    'timestamp': latest_fatigue.get('Timestamp', '').isoformat() if latest_fatigue.get('Timestamp') else None
+                    'timestamp': ts.isoformat() if hasattr(ts, 'isoformat') else ts
                 }), 200
         except Exception as db_error:
             logger.debug(f"Database error in get_fatigue_status: {db_error}")
@@ -393,7 +525,7 @@ def get_fatigue_status():
             'blink_rate': 18.0,
             'facial_expression': 'neutral',
             'alert_generated': False,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': iso_now()
         }), 200
             
     except Exception as e:
@@ -401,265 +533,311 @@ def get_fatigue_status():
         return jsonify({
             'fatigue_score': 0.0, 'eye_strain_level': 0, 'posture_score': 1.0,
             'blink_rate': 18.0, 'facial_expression': 'neutral', 'alert_generated': False,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': iso_now()
         }), 200
 
-@app.route('/api/v1/fatigue/recommendations', methods=['GET'])
+@api_route('/api/v1/fatigue/recommendations', methods=['GET'])
 def get_fatigue_recommendations():
     """Get recommendations based on fatigue"""
-    try:
-        recommendations = fatigue_detector.get_recommendations_for_fatigue()
-        return jsonify({'recommendations': recommendations}), 200
-    except Exception as e:
-        logger.error(f"Error getting fatigue recommendations: {e}")
-        return jsonify({'error': str(e)}), 500
+    recommendations = fatigue_detector.get_recommendations_for_fatigue()
+    return jsonify({'recommendations': recommendations}), 200
 
 # ==================== BREAK MANAGEMENT ====================
 
-@app.route('/api/v1/breaks/enforce', methods=['POST'])
+@api_route('/api/v1/breaks/enforce', methods=['POST'])
 def enforce_break():
     """Enforce a break with single-instance check"""
-    try:
-        if break_enforcer.is_enforcing:
-            return jsonify({
-                'message': 'Break already in progress',
-                'status': 'busy'
-            }), 400
-
-        data = request.get_json() or {}
-        user_id = data.get('user_id', 1)
-        duration = data.get('duration', 5)  # minutes
-        break_type = data.get('break_type', 'micro')
-        lock_screen = data.get('lock_screen', True)
-        mute_input = data.get('mute_input', True)
-        
-        # Log break to database
-        break_record = {
-            'duration': duration,
-            'break_type': break_type,
-            'reason': data.get('reason', 'Enforced Break'),
-            'compliance_status': 'In Progress'
-        }
-        break_id = data_service.log_break(user_id, break_record)
-        
-        # Start break enforcement with record tracking
-        break_enforcer.enforce_break(
-            duration * 60,  # Convert to seconds
-            break_type,
-            lock_screen,
-            mute_input
-        )
-        
-        # Add to local analytics for immediate UI updates
-        productivity_analytics.record_break_session(user_id, {
-            'duration': duration * 60,
-            'break_type': break_type,
-            'forced': True,
-            'complied': True # Assume compliance unless they bypass (if bypass exists)
-        })
-        
-        # Update break status to completed once it's done (simple async-like update)
-        def mark_break_complete(b_id):
-            time.sleep(duration * 60)
-            data_service.update_break_compliance(b_id, 'Completed')
-            
-        if isinstance(break_id, int):
-            threading.Thread(target=mark_break_complete, args=(break_id,), daemon=True).start()
-        
-        # Show notification
-        break_enforcer.show_notification(
-            'Micro Break',
-            f'Time for a {break_type} break! Duration: {duration} minutes'
-        )
-        
+    if break_enforcer.is_enforcing:
         return jsonify({
-            'message': f'{break_type} break enforced',
-            'duration': duration,
-            'timestamp': datetime.now().isoformat()
-        }), 200
-    except Exception as e:
-        logger.error(f"Error enforcing break: {e}")
-        return jsonify({'error': str(e)}), 500
+            'message': 'Break already in progress',
+            'status': 'busy'
+        }), 400
+
+    data = request.get_json(silent=True, cache=True) or {}
+    user_id = data.get('user_id', 1)
+    duration = data.get('duration', 5)  # minutes
+    break_type = data.get('break_type', 'micro')
+    lock_screen = data.get('lock_screen', True)
+    mute_input = data.get('mute_input', True)
+    
+    # Log break to database in the background - the break should start
+    # without waiting on DB latency
+    break_record = {
+        'duration': duration,
+        'break_type': break_type,
+        'reason': data.get('reason', 'Enforced Break'),
+        'compliance_status': 'In Progress'
+    }
+    _db_executor.submit(_log_and_track_break, user_id, break_record, duration)
+    
+    # Start break enforcement with record tracking
+    break_enforcer.enforce_break(
+        duration * 60,  # Convert to seconds
+        break_type,
+        lock_screen,
+        mute_input
+    )
+    
+    # Add to local analytics for immediate UI updates
+    productivity_analytics.record_break_session(user_id, {
+        'duration': duration * 60,
+        'break_type': break_type,
+        'forced': True,
+        'complied': True # Assume compliance unless they bypass (if bypass exists)
+    })
+    
+    # Show notification
+    break_enforcer.show_notification(
+        'Micro Break',
+        f'Time for a {break_type} break! Duration: {duration} minutes'
+    )
+    
+    return jsonify({
+        'message': f'{break_type} break enforced',
+        'duration': duration,
+        'timestamp': iso_now()
+    }), 200
 
-@app.route('/api/v1/breaks/status', methods=['GET'])
+@api_route('/api/v1/breaks/status', methods=['GET'])
 def get_break_status():
     """Get break enforcement status"""
-    try:
-        user_id = request.args.get('user_id', 1, type=int)
-        
-        # Get breaks from today from database
-        breaks_today = data_service.get_breaks_today(user_id)
-        compliance_rate = data_service.get_break_compliance_rate(user_id, days=7)
-        
-        # Check if a break is CURRENTLY being enforced
-        is_enforcing = break_enforcer.is_enforcing
-        time_remaining = 0
-        if is_enforcing and break_enforcer.start_time:
-            # datetime.now() vs break_enforcer.start_time
-            # Ensure both are naive or both are aware. Here we use naive local time.
-            now = datetime.now()
-            elapsed = (now - break_enforcer.start_time).total_seconds()
-            time_remaining = max(0, break_enforcer.break_duration - elapsed)
-            
-            # If time is up but enforcement flag is still True, double check
-            if time_remaining <= 0:
-                is_enforcing = False
-        
-        return jsonify({
-            'is_enforcing': is_enforcing,
-            'time_remaining': int(time_remaining),
-            'breaks_today': len(breaks_today),
-            'compliance_rate': compliance_rate,
-            'recent_breaks': [str(b) for b in (breaks_today[:5] if breaks_today else [])]
-        }), 200
-    except Exception as e:
-        logger.error(f"Error getting break status: {e}")
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/api/v1/breaks/stop', methods=['POST'])
+    user_id = request.args.get('user_id', 1, type=int)
+    
+    # Get today's breaks and the 7-day compliance rate in one DB round-trip
+    bundle = data_service.get_break_status_bundle(user_id, days=7)
+    breaks_today = bundle['breaks_today']
+    compliance_rate = bundle['compliance_rate']
+    
+    # Check if a break is CURRENTLY being enforced
+    is_enforcing = break_enforcer.is_enforcing
+    time_remaining = 0
+    if is_enforcing and break_enforcer.start_time:
+        # datetime.now() vs break_enforcer.start_time
+        # Ensure both are naive or both are aware. Here we use naive local time.
+        now = datetime.now()
+        elapsed = (now - break_enforcer.start_time).total_seconds()
+        time_remaining = max(0, break_enforcer.break_duration - elapsed)
+        
+        # If time is up but enforcement flag is still True, double check
+        if time_remaining <= 0:
+            is_enforcing = False
+    
+    return jsonify({
+        'is_enforcing': is_enforcing,
+        'time_remaining': int(time_remaining),
+        'breaks_today': len(breaks_today),
+        'compliance_rate': compliance_rate,
+        'recent_breaks': [str(b) for b in (breaks_today[:5] if breaks_today else [])]
+    }), 200
+
+@api_route('/api/v1/breaks/stop', methods=['POST'])
 def stop_break():
     """Stop current break enforcement"""
-    try:
-        break_enforcer.stop_enforcement()
-        return jsonify({'message': 'Break enforcement stopped'}), 200
-    except Exception as e:
-        logger.error(f"Error stopping break: {e}")
-        return jsonify({'error': str(e)}), 500
+    break_enforcer.stop_enforcement()
+    return jsonify({'message': 'Break enforcement stopped'}), 200
 
 # ==================== RECOMMENDATIONS ====================
 
-@app.route('/api/v1/recommendations', methods=['GET'])
+@api_route('/api/v1/recommendations', methods=['GET'])
 def get_recommendations():
     """Get personalized break recommendations"""
-    try:
-        user_id = request.args.get('user_id', 1, type=int)
-        fatigue_status = fatigue_detector.get_fatigue_status()
-        activity_summary = activity_monitor.get_activity_summary()
-        
-        recommendations = break_recommender.get_recommendations(
-            fatigue_status,
-            activity_summary,
-            user_id,
-            count=2
-        )
-        
-        # Log recommendations to database
-        for rec in recommendations:
-            data_service.log_recommendation(user_id, rec)
-        
-        return jsonify({'recommendations': recommendations}), 200
-    except Exception as e:
-        logger.error(f"Error getting recommendations: {e}")
-        return jsonify({'error': str(e)}), 500
+    user_id = request.args.get('user_id', 1, type=int)
+    fatigue_status = get_fatigue_snapshot()
+    activity_summary = get_activity_snapshot()
+    
+    recommendations = break_recommender.get_recommendations(
+        fatigue_status,
+        activity_summary,
+        user_id,
+        count=2
+    )
+    
+    # Log recommendations to database in one round-trip
+    data_service.log_recommendations_bulk(user_id, recommendations)
+    
+    return jsonify({'recommendations': recommendations}), 200
 
 # ==================== PERSONALIZATION ====================
 
-@app.route('/api/v1/personalization/profile', methods=['GET'])
+@api_route('/api/v1/personalization/profile', methods=['GET'])
 def get_user_profile():
     """Get user profile"""
-    try:
-        user_id = request.args.get('user_id', 1, type=int)
-        profile = personalization_engine.get_user_profile(user_id)
-        
-        if profile:
-            return jsonify(profile), 200
-        else:
-            return jsonify({'error': 'Profile not found'}), 404
-    except Exception as e:
-        logger.error(f"Error getting profile: {e}")
-        return jsonify({'error': str(e)}), 500
+    user_id = request.args.get('user_id', 1, type=int)
+    profile = personalization_engine.get_user_profile(user_id)
+    
+    if profile:
+        return jsonify(profile), 200
+    else:
+        return jsonify({'error': 'Profile not found'}), 404
 
-@app.route('/api/v1/personalization/preferences', methods=['PUT'])
+@api_route('/api/v1/personalization/preferences', methods=['PUT'])
 def update_preferences():
     """Update user preferences"""
-    try:
-        data = request.get_json() or {}
-        user_id = data.get('user_id', 1)
-        preferences = data.get('preferences', {})
-        
-        if personalization_engine.update_user_preferences(user_id, preferences):
-            return jsonify({'message': 'Preferences updated'}), 200
-        else:
-            return jsonify({'error': 'Update failed'}), 500
-    except Exception as e:
-        logger.error(f"Error updating preferences: {e}")
-        return jsonify({'error': str(e)}), 500
+    data = request.get_json(silent=True, cache=True) or {}
+    user_id = data.get('user_id', 1)
+    preferences = data.get('preferences', {})
+    
+    if personalization_engine.update_user_preferences(user_id, preferences):
+        return jsonify({'message': 'Preferences updated'}), 200
+    else:
+        return jsonify({'error': 'Update failed'}), 500
 
-@app.route('/api/v1/personalization/analyze', methods=['POST'])
+@api_route('/api/v1/personalization/analyze', methods=['POST'])
 def analyze_patterns():
     """Analyze user patterns"""
-    try:
-        data = request.get_json() or {}
-        user_id = data.get('user_id', 1)
-        analysis = personalization_engine.analyze_patterns(user_id)
-        
-        if analysis:
-            return jsonify(analysis), 200
-        else:
-            return jsonify({'message': 'Not enough data for analysis'}), 202
-    except Exception as e:
-        logger.error(f"Error analyzing patterns: {e}")
-        return jsonify({'error': str(e)}), 500
+    data = request.get_json(silent=True, cache=True) or {}
+    user_id = data.get('user_id', 1)
+    analysis = personalization_engine.analyze_patterns(user_id)
+    
+    if analysis:
+        return jsonify(analysis), 200
+    else:
+        return jsonify({'message': 'Not enough data for analysis'}), 202
 
 # ==================== ANALYTICS ====================
 
-@app.route('/api/v1/analytics/daily', methods=['GET'])
+@api_route('/api/v1/analytics/daily', methods=['GET'])
 def get_daily_analytics():
     """Get daily analytics"""
-    try:
-        user_id = request.args.get('user_id', 1, type=int)
-        date_str = request.args.get('date', None)
-        
-        # Get metrics from database
-        metrics = data_service.get_daily_metrics(user_id, date_str)
-        
-        return jsonify(metrics), 200
-    except Exception as e:
-        logger.error(f"Error getting daily analytics: {e}")
-        return jsonify({'error': str(e)}), 500
+    user_id = request.args.get('user_id', 1, type=int)
+    date_str = request.args.get('date', None)
+    
+    # Get metrics from database
+    metrics = data_service.get_daily_metrics(user_id, date_str)
+    
+    return jsonify(metrics), 200
 
-@app.route('/api/v1/analytics/weekly', methods=['GET'])
+@api_route('/api/v1/analytics/weekly', methods=['GET'])
 def get_weekly_analytics():
     """Get weekly analytics"""
-    try:
-        user_id = request.args.get('user_id', 1, type=int)
-        metrics = data_service.get_weekly_metrics(user_id)
-        
-        return jsonify(metrics), 200
-    except Exception as e:
-        logger.error(f"Error getting weekly analytics: {e}")
-        return jsonify({'error': str(e)}), 500
+    user_id = request.args.get('user_id', 1, type=int)
+    metrics = data_service.get_weekly_metrics(user_id)
+    
+    return jsonify(metrics), 200
 
-@app.route('/api/v1/analytics/monthly', methods=['GET'])
+@api_route('/api/v1/dashboard/bundle', methods=['GET'])
+def get_dashboard_bundle():
+    """Get the full dashboard read set in one request"""
+    user_id = request.args.get('user_id', 1, type=int)
+    bundle = data_service.get_dashboard_bundle(user_id)
+
+    return jsonify(bundle), 200
+
+@api_route('/api/v1/analytics/monthly', methods=['GET'])
 def get_monthly_analytics():
     """Get monthly analytics"""
-    try:
-        user_id = request.args.get('user_id', 1, type=int)
-        metrics = data_service.get_weekly_metrics(user_id)  # Using weekly for now
-        
-        return jsonify(metrics), 200
-    except Exception as e:
-        logger.error(f"Error getting monthly analytics: {e}")
-        return jsonify({'error': str(e)}), 500
+    user_id = request.args.get('user_id', 1, type=int)
+    metrics = data_service.get_weekly_metrics(user_id)  # Using weekly for now
+    
+    return jsonify(metrics), 200
 
 # ==================== FRONTEND STATIC FILES ====================
 
+# Resolved once at import time - no per-request path joins
+FRONTEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'frontend'))
+
+# Small frontend assets preloaded into memory at startup - the dashboard
+# fetches the same handful of JS/CSS files repeatedly, so serving from a
+# dict avoids disk I/O per request and gives us trivial ETag revalidation
+_STATIC_MAX_BYTES = 1024 * 1024
+_static_cache = {}
+
+def _load_static_cache():
+    for root, _dirs, files in os.walk(FRONTEND_DIR):
+        for name in files:
+            path = os.path.join(root, name)
+            try:
+                if os.path.getsize(path) > _STATIC_MAX_BYTES:
+                    continue
+                with open(path, 'rb') as f:
+                    body = f.read()
+            except OSError as e:
+                logger.warning(f"Could not preload static file {path}: {e}")
+                continue
+            rel = os.path.relpath(path, FRONTEND_DIR).replace(os.sep, '/')
+            mimetype = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+            etag = hashlib.blake2b(body, digest_size=8).hexdigest()
+            _static_cache[rel] = (body, mimetype, etag)
+
+_load_static_cache()
+
+def _serve_cached_static(rel):
+    """Serve a preloaded asset from memory (with conditional 304), or None"""
+    cached = _static_cache.get(rel)
+    if cached is None:
+        return None
+    body, mimetype, etag = cached
+    response = app.response_class(body, mimetype=mimetype)
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = 3600
+    return response.make_conditional(request)
+
 @app.route('/')
 def serve_index():
     """Serve the main index.html file"""
-    frontend_dir = os.path.join(os.path.dirname(__file__), '..', 'frontend')
-    return send_from_directory(frontend_dir, 'index.html')
+    return _serve_cached_static('index.html') or send_from_directory(FRONTEND_DIR, 'index.html')
 
 @app.route('/<path:filename>')
 def serve_static(filename):
     """Serve static files (CSS, JS, etc.)"""
-    frontend_dir = os.path.join(os.path.dirname(__file__), '..', 'frontend')
-    # Check if file exists in frontend directory
-    file_path = os.path.join(frontend_dir, filename)
-    if os.path.exists(file_path):
-        return send_from_directory(frontend_dir, filename)
-    # Return 404 for missing files
-    return jsonify({'error': 'File not found'}), 404
+    response = _serve_cached_static(filename)
+    if response is not None:
+        return response
+    # Fallback for anything not preloaded (large or newly added files);
+    # send_from_directory raises NotFound itself for missing files (the
+    # 404 errorhandler turns that into JSON)
+    return send_from_directory(FRONTEND_DIR, filename, max_age=3600)
+
+# ==================== RESPONSE COMPRESSION ====================
+
+@app.after_request
+def compress_response(response):
+    """Gzip larger JSON responses (analytics payloads) when the client supports it"""
+    try:
+        if (response.status_code != 200
+                or response.direct_passthrough  # static files served via sendfile
+                or 'Content-Encoding' in response.headers
+                or not response.mimetype == 'application/json'
+                or 'gzip' not in request.headers.get('Accept-Encoding', '').lower()):
+            return response
+
+        body = response.get_data()
+        if len(body) < 512:
+            return response
+
+        # compresslevel=1 favors latency; JSON still shrinks dramatically
+        response.set_data(gzip.compress(body, compresslevel=1))
+        response.headers['Content-Encoding'] = 'gzip'
+        response.vary.add('Accept-Encoding')
+    except Exception as e:
+        logger.debug(f"Response compression skipped: {e}")
+    return response
+
+# Polled endpoints whose bodies rarely change between polls
+_ETAG_PATHS = frozenset({
+    '/api/v1/activity/current',
+    '/api/v1/fatigue/status',
+    '/api/v1/monitoring/status',
+    '/api/v1/breaks/status',
+})
+
+@app.after_request
+def conditional_polling(response):
+    """Answer steady-state polls with 304 Not Modified via a body-hash ETag"""
+    # Registered after compress_response, so this runs first in Flask's
+    # reversed after_request chain - the ETag covers the uncompressed body
+    try:
+        if (request.method == 'GET'
+                and request.path in _ETAG_PATHS
+                and response.status_code == 200
+                and not response.direct_passthrough):
+            etag = hashlib.blake2b(response.get_data(), digest_size=8).hexdigest()
+            response.set_etag(etag)
+            return response.make_conditional(request)
+    except Exception as e:
+        logger.debug(f"Conditional response skipped: {e}")
+    return response
 
 # ==================== ERROR HANDLERS ====================
 
@@ -695,6 +873,9 @@ def cleanup_on_exit():
         if fatigue_detector and fatigue_detector.is_running:
             fatigue_detector.stop_detection()
         
+        # Flush pending background DB writes before closing the pool
+        _db_executor.shutdown(wait=True)
+
         # Close database connections
         if db_manager:
             db_manager.close_pool()
@@ -710,20 +891,28 @@ def handle_signal(signum, frame):
     import sys
     sys.exit(0)
 
-# Register cleanup handlers
+# Register cleanup handlers. Signal handlers can only be installed from the
+# main thread - under a WSGI server that imports this module elsewhere,
+# signal.signal would raise ValueError, so rely on the server's own graceful
+# shutdown plus atexit in that case.
 atexit.register(cleanup_on_exit)
-signal.signal(signal.SIGINT, handle_signal)
-signal.signal(signal.SIGTERM, handle_signal)
+if threading.current_thread() is threading.main_thread():
+    signal.signal(signal.SIGINT, handle_signal)
+    signal.signal(signal.SIGTERM, handle_signal)
 
 if __name__ == '__main__':
     try:
         logger.info("Starting AI Micro Break System...")
-        
+
+        # Sanity check: the factories are cached, so cleanup_on_exit closes
+        # the same pool the endpoints use
+        assert db_manager is get_database_manager()
+
         # Start background system monitor
         start_background_task()
         
         # Create logs directory if not exists
-        os.makedirs(LOGGING_CONFIG['log_dir'], exist_ok=True)
+        os.makedirs(_LOG_DIR, exist_ok=True)
         
         # Test database connection
         if db_manager.health_check():
@@ -731,13 +920,31 @@ if __name__ == '__main__':
         else:
             logger.warning("Could not connect to database - some features may not work")
         
-        # Run Flask app
-        logger.info(f"Starting server on 0.0.0.0:{APP_CONFIG['port']}")
-        app.run(
-            host='0.0.0.0',
-            port=APP_CONFIG['port'],
-            debug=APP_CONFIG['debug']
-        )
+        # Run server - Werkzeug dev server only when explicitly in dev mode,
+        # otherwise a threaded production WSGI server so concurrent requests
+        # actually exercise the DB connection pool (threads <= pool_size)
+        logger.info(f"Starting server on 0.0.0.0:{_PORT}")
+        if os.environ.get('FLASK_ENV') == 'dev':
+            app.run(
+                host='0.0.0.0',
+                port=_PORT,
+                debug=_DEBUG
+            )
+        else:
+            try:
+                from waitress import serve
+                # Thread count is tunable but capped at the DB pool size so
+                # concurrent I/O-bound polls multiplex without exhausting
+                # pool connections
+                threads = min(int(os.environ.get('WEB_CONCURRENCY', 8)), 10)
+                serve(app, host='0.0.0.0', port=_PORT, threads=threads)
+            except ImportError:
+                logger.warning("waitress not installed - falling back to Flask dev server")
+                app.run(
+                    host='0.0.0.0',
+                    port=_PORT,
+                    debug=False
+                )
         
     except KeyboardInterrupt:
         logger.info("Received keyboard interrupt")
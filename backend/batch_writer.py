@@ -0,0 +1,93 @@
+"""
+Background batch writer for high-volume insert tables
+Coalesces per-event single-row INSERTs into periodic executemany flushes
+so activity/fatigue sampling costs one transaction per interval, not per row
+"""
+
+import atexit
+import logging
+import os
+import queue
+import threading
+from functools import lru_cache
+from typing import List
+
+logger = logging.getLogger(__name__)
+
+BATCH_WRITES_ENABLED = os.environ.get('BATCH_WRITES', '1') != '0'
+FLUSH_INTERVAL = 0.5    # seconds between drains
+FLUSH_THRESHOLD = 200   # rows per statement that trigger an early drain
+
+
+class BatchWriter:
+    """Buffers parameter rows per INSERT statement and flushes them in batches"""
+
+    def __init__(self, db_manager):
+        self.db = db_manager
+        self._queues = {}  # INSERT statement -> queue of parameter rows
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def enqueue(self, query: str, params: List) -> bool:
+        """Queue a row for the given INSERT; flushed within FLUSH_INTERVAL"""
+        with self._lock:
+            buffer = self._queues.get(query)
+            if buffer is None:
+                buffer = self._queues[query] = queue.Queue()
+            self._ensure_thread()
+        buffer.put(params)
+        if buffer.qsize() >= FLUSH_THRESHOLD:
+            self._wakeup.set()
+        return True
+
+    def _ensure_thread(self):
+        # Called with the lock held
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._flush_loop,
+                name='batch-writer',
+                daemon=True
+            )
+            self._thread.start()
+
+    def _flush_loop(self):
+        while not self._stop.is_set():
+            self._wakeup.wait(FLUSH_INTERVAL)
+            self._wakeup.clear()
+            self.flush_all()
+
+    def flush_all(self):
+        """Drain every buffer with one executemany per statement"""
+        with self._lock:
+            buffers = list(self._queues.items())
+        for query, buffer in buffers:
+            rows = []
+            while True:
+                try:
+                    rows.append(buffer.get_nowait())
+                except queue.Empty:
+                    break
+            if rows and not self.db.execute_many(query, rows):
+                # execute_many already retried; losing samples is preferable
+                # to blocking the capture threads behind a dead database
+                logger.error(f"Batch flush dropped {len(rows)} rows")
+
+    def stop(self):
+        """Stop the flusher thread and drain remaining rows"""
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=2)
+        self.flush_all()
+
+
+@lru_cache(maxsize=1)
+def get_batch_writer() -> BatchWriter:
+    """Get or create batch writer instance (idempotent singleton)"""
+    # Imported lazily to avoid a cycle with database_manager
+    from backend.database_manager import get_database_manager
+    writer = BatchWriter(get_database_manager())
+    atexit.register(writer.stop)
+    return writer
@@ -4,13 +4,41 @@ Bridges modules with database for persistent storage and retrieval
 """
 
 import logging
+from collections import deque
 from datetime import datetime, date
 from typing import Dict, List, Optional, Union
 from backend.database_manager import get_database_manager
+from backend.metrics_cache import cached, metrics_cache
+from functools import lru_cache
 import json
+import time
 
 logger = logging.getLogger(__name__)
 
+# Compact JSON for stored preference blobs; orjson when available
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj) -> str:
+        return json.dumps(obj, separators=(',', ':'))
+
+
+@lru_cache(maxsize=1)
+def _today_for_minute(minute: int) -> str:
+    return date.today().isoformat()
+
+
+def _today_iso() -> str:
+    """Today's ISO date string, recomputed at most once per minute"""
+    return _today_for_minute(int(time.time() // 60))
+
 
 class DataService:
     """Service layer for data persistence and retrieval"""
@@ -22,41 +50,106 @@ class DataService:
     
     def log_activity(self, user_id: int, activity_data: Dict) -> bool:
         """Log activity to database"""
+        metrics_cache.invalidate_user(user_id)
         return self.db.log_activity(user_id, activity_data)
     
+    def log_activities_bulk(self, user_id: int, activities: List[Dict]) -> bool:
+        """Log multiple activity entries in one executemany round-trip"""
+        if not activities:
+            return True
+        metrics_cache.invalidate_user(user_id)
+        query = """
+            INSERT INTO ActivityLog
+            (UserID, MouseActivity, KeyboardActivity, ScreenInteractionTime, IdlePeriod, ApplicationName)
+            VALUES (%s, %s, %s, %s, %s, %s)
+        """
+        params_seq = [
+            [
+                user_id,
+                a.get('mouse_clicks', 0),
+                a.get('keyboard_presses', 0),
+                a.get('screen_time', 0),
+                a.get('idle_time', 0),
+                a.get('app_name', 'Unknown')
+            ]
+            for a in activities
+        ]
+        if not self.db.execute_many(query, params_seq):
+            return False
+
+        # Keep the per-minute rollup buckets and the latest-activity
+        # snapshot in step with the raw rows, as log_activity does:
+        # get_activity_summary reads only ActivityRollup, so raw-only
+        # inserts would be invisible to it
+        bucket_ts = datetime.now().replace(second=0, microsecond=0)
+        rollup_seq = [
+            [user_id, bucket_ts, p[1], p[2], p[4], p[3]]
+            for p in params_seq
+        ]
+        self.db.execute_many(self.db.ROLLUP_UPSERT, rollup_seq)
+
+        last = params_seq[-1]
+        self.db.update_current_state(user_id, 'LastActivity', {
+            'Timestamp': datetime.now(),
+            'MouseActivity': last[1],
+            'KeyboardActivity': last[2],
+            'ScreenInteractionTime': last[3],
+            'IdlePeriod': last[4],
+            'ApplicationName': last[5]
+        })
+        return True
+
+    def _get_current_state(self, user_id: int, column: str) -> Optional[Dict]:
+        """PK lookup of one UserCurrentState snapshot column, parsed from JSON"""
+        row = self.db.fetch_one(
+            f"SELECT {column} FROM UserCurrentState WHERE UserID = %s",
+            [user_id]
+        )
+        if row and row.get(column):
+            try:
+                return _json_loads(row[column])
+            except ValueError:
+                pass
+        return None
+
     def get_latest_activity(self, user_id: int) -> Optional[Dict]:
         """Get latest activity log entry"""
+        # Snapshot first: a single PK lookup instead of a top-1 index seek
+        state = self._get_current_state(user_id, 'LastActivity')
+        if state is not None:
+            return state
+
         query = """
-            SELECT * FROM ActivityLog 
-            WHERE UserID = %s 
-            ORDER BY Timestamp DESC 
+            SELECT Timestamp, MouseActivity, KeyboardActivity,
+                   ScreenInteractionTime, IdlePeriod, ApplicationName
+            FROM ActivityLog
+            WHERE UserID = %s
+            ORDER BY Timestamp DESC
             LIMIT 1
         """
         return self.db.fetch_one(query, [user_id])
     
+    @cached(ttl=15)
     def get_activity_summary(self, user_id: int, hours: int = 1) -> Dict:
         """Get activity summary for last N hours"""
+        # Served from the per-minute ActivityRollup buckets (~60 rows/hour)
+        # instead of re-scanning every raw ActivityLog sample in the window;
+        # COALESCE keeps the aggregate contract non-null at the SQL layer
         query = """
-            SELECT 
-                COUNT(*) as total_entries,
-                SUM(MouseActivity) as total_clicks,
-                SUM(KeyboardActivity) as total_presses,
-                SUM(IdlePeriod) as total_idle,
-                AVG(ScreenInteractionTime) as avg_screen_time
-            FROM ActivityLog
-            WHERE UserID = %s AND Timestamp >= DATE_SUB(NOW(), INTERVAL %s HOUR)
+            SELECT
+                COALESCE(SUM(SampleCount), 0) as total_logs,
+                COALESCE(SUM(Clicks), 0) as total_mouse_clicks,
+                COALESCE(SUM(Presses), 0) as total_keyboard_presses,
+                COALESCE(SUM(IdleTime), 0) as total_idle_time,
+                COALESCE(SUM(ScreenTime) / NULLIF(SUM(SampleCount), 0), 0) as avg_screen_time
+            FROM ActivityRollup
+            WHERE UserID = %s AND BucketTS >= DATE_SUB(NOW(), INTERVAL %s HOUR)
         """
         result = self.db.fetch_one(query, [user_id, hours])
-        
+
         if result:
-            return {
-                'total_logs': result.get('total_entries', 0) or 0,
-                'total_mouse_clicks': result.get('total_clicks', 0) or 0,
-                'total_keyboard_presses': result.get('total_presses', 0) or 0,
-                'total_idle_time': result.get('total_idle', 0) or 0,
-                'avg_screen_time': result.get('avg_screen_time', 0) or 0
-            }
-        
+            return dict(result)
+
         return {
             'total_logs': 0,
             'total_mouse_clicks': 0,
@@ -69,14 +162,47 @@ class DataService:
     
     def log_fatigue(self, user_id: int, fatigue_data: Dict) -> bool:
         """Log fatigue detection to database"""
+        metrics_cache.invalidate_user(user_id)
         return self.db.log_fatigue(user_id, fatigue_data)
     
+    def log_fatigue_bulk(self, user_id: int, entries: List[Dict]) -> bool:
+        """Log multiple fatigue entries in one executemany round-trip"""
+        if not entries:
+            return True
+        metrics_cache.invalidate_user(user_id)
+        query = """
+            INSERT INTO FatigueDetection
+            (UserID, FatigueScore, EyeStrainLevel, BlinkRate, PostureScore, FacialExpression, WebcamDataUsed, AlertGenerated)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+        """
+        params_seq = [
+            [
+                user_id,
+                f.get('fatigue_score', 0),
+                f.get('eye_strain_level', 0),
+                f.get('blink_rate', 0),
+                f.get('posture_score', 0),
+                f.get('facial_expression', 'neutral'),
+                f.get('webcam_data_used', False),
+                f.get('alert_generated', False)
+            ]
+            for f in entries
+        ]
+        return self.db.execute_many(query, params_seq)
+
     def get_latest_fatigue(self, user_id: int) -> Optional[Dict]:
         """Get latest fatigue detection"""
+        # Snapshot first: a single PK lookup instead of a top-1 index seek
+        state = self._get_current_state(user_id, 'LastFatigue')
+        if state is not None:
+            return state
+
         query = """
-            SELECT * FROM FatigueDetection 
-            WHERE UserID = %s 
-            ORDER BY Timestamp DESC 
+            SELECT FatigueScore, EyeStrainLevel, PostureScore, BlinkRate,
+                   FacialExpression, AlertGenerated, Timestamp
+            FROM FatigueDetection
+            WHERE UserID = %s
+            ORDER BY Timestamp DESC
             LIMIT 1
         """
         return self.db.fetch_one(query, [user_id])
@@ -90,25 +216,56 @@ class DataService:
             ORDER BY Timestamp DESC 
             LIMIT %s
         """
-        results = self.db.fetch_all(query, [user_id, last_n])
-        return list(reversed(results)) if results else []
+        # Stream newest-first and appendleft to come out chronological;
+        # memory stays O(last_n) even if the limit grows for exports
+        trend = deque(maxlen=last_n)
+        try:
+            for row in self.db.fetch_iter(query, [user_id, last_n]):
+                trend.appendleft(row)
+        except Exception as e:
+            logger.error(f"Error fetching fatigue trend: {e}")
+        return list(trend)
     
+    @cached(ttl=15)
     def get_average_fatigue(self, user_id: int, hours: int = 1) -> float:
         """Get average fatigue for last N hours"""
         query = """
-            SELECT AVG(FatigueScore) as avg_fatigue 
+            SELECT COALESCE(AVG(FatigueScore), 0) as avg_fatigue
             FROM FatigueDetection
             WHERE UserID = %s AND Timestamp >= DATE_SUB(NOW(), INTERVAL %s HOUR)
         """
         result = self.db.fetch_one(query, [user_id, hours])
-        return float(result.get('avg_fatigue', 0) or 0) if result else 0.0
+        return float(result['avg_fatigue']) if result else 0.0
     
     # ==================== BREAK LOGGING ====================
     
     def log_break(self, user_id: int, break_data: Dict) -> Union[bool, int]:
         """Log break and return ID if successful"""
+        metrics_cache.invalidate_user(user_id)
         return self.db.log_break(user_id, break_data)
     
+    def log_breaks_bulk(self, user_id: int, breaks: List[Dict]) -> bool:
+        """Log multiple break records in one executemany round-trip"""
+        if not breaks:
+            return True
+        metrics_cache.invalidate_user(user_id)
+        query = """
+            INSERT INTO BreakRecords
+            (UserID, BreakDuration, BreakType, Reason, ComplianceStatus)
+            VALUES (%s, %s, %s, %s, %s)
+        """
+        params_seq = [
+            [
+                user_id,
+                b.get('duration', 5),
+                b.get('break_type', 'micro'),
+                b.get('reason', 'Scheduled'),
+                b.get('compliance_status', 'Pending')
+            ]
+            for b in breaks
+        ]
+        return self.db.execute_many(query, params_seq)
+
     def update_break_compliance(self, break_id: int, status: str) -> bool:
         """Update break compliance status"""
         return self.db.update_break_status(break_id, status)
@@ -116,36 +273,108 @@ class DataService:
     def get_breaks_today(self, user_id: int) -> List[Dict]:
         """Get all breaks taken today"""
         query = """
-            SELECT * FROM BreakRecords 
+            SELECT BreakID, BreakStartTime, BreakEndTime, BreakDuration,
+                   BreakType, Reason, ComplianceStatus
+            FROM BreakRecords
             WHERE UserID = %s AND DATE(BreakStartTime) = CURDATE()
             ORDER BY BreakStartTime DESC
         """
         return self.db.fetch_all(query, [user_id])
     
+    @cached(ttl=30)
     def get_break_compliance_rate(self, user_id: int, days: int = 7) -> float:
         """Get break compliance rate for last N days"""
         query = """
-            SELECT 
-                SUM(CASE WHEN ComplianceStatus = 'Completed' THEN 1 ELSE 0 END) as completed,
+            SELECT
+                COALESCE(SUM(ComplianceStatus = 'Completed'), 0) as completed,
                 COUNT(*) as total
             FROM BreakRecords
             WHERE UserID = %s AND BreakStartTime >= DATE_SUB(NOW(), INTERVAL %s DAY)
         """
         result = self.db.fetch_one(query, [user_id, days])
-        
-        if result and result.get('total', 0) > 0:
-            return (result.get('completed', 0) or 0) / result.get('total', 1)
+
+        if result and result['total'] > 0:
+            return result['completed'] / result['total']
         return 0.0
     
+    def get_break_status_bundle(self, user_id: int, days: int = 7) -> Dict:
+        """Get today's breaks and the N-day compliance rate in one query
+
+        /breaks/status needs both; fetching the recent window once saves a
+        pool connection and round-trip per poll.
+        """
+        query = """
+            SELECT BreakID, BreakStartTime, BreakEndTime, BreakDuration,
+                   BreakType, Reason, ComplianceStatus
+            FROM BreakRecords
+            WHERE UserID = %s AND BreakStartTime >= DATE_SUB(NOW(), INTERVAL %s DAY)
+            ORDER BY BreakStartTime DESC
+        """
+        rows = self.db.fetch_all(query, [user_id, days])
+
+        today = date.today()
+        breaks_today = [
+            r for r in rows
+            if r.get('BreakStartTime') and r['BreakStartTime'].date() == today
+        ]
+        completed = sum(1 for r in rows if r.get('ComplianceStatus') == 'Completed')
+
+        return {
+            'breaks_today': breaks_today,
+            'compliance_rate': completed / len(rows) if rows else 0.0
+        }
+
+    # ==================== DASHBOARD ====================
+
+    @cached(ttl=5)
+    def get_dashboard_bundle(self, user_id: int) -> Dict:
+        """Fetch the whole dashboard read set in one DB round-trip
+
+        The dashboard otherwise issues six sequential queries per refresh;
+        batching them through fetch_multi costs one connection checkout
+        and one network round-trip instead.
+        """
+        uid = int(user_id)  # multi-statement batches can't bind params per statement
+        sql = f"""
+            SELECT * FROM ActivityLog WHERE UserID = {uid}
+                ORDER BY Timestamp DESC LIMIT 1;
+            SELECT * FROM FatigueDetection WHERE UserID = {uid}
+                ORDER BY Timestamp DESC LIMIT 1;
+            SELECT * FROM BreakRecords WHERE UserID = {uid}
+                AND DATE(BreakStartTime) = CURDATE()
+                ORDER BY BreakStartTime DESC;
+            SELECT * FROM ProductivityAnalytics WHERE UserID = {uid}
+                AND Date = CURDATE();
+            SELECT * FROM Recommendations WHERE UserID = {uid}
+                ORDER BY Timestamp DESC LIMIT 5;
+            SELECT * FROM PersonalizationProfile WHERE UserID = {uid}
+        """
+        result_sets = self.db.fetch_multi(sql)
+        if result_sets is None or len(result_sets) != 6:
+            return {}
+
+        activity, fatigue, breaks, analytics, recommendations, prefs = result_sets
+        return {
+            'latest_activity': activity[0] if activity else None,
+            'latest_fatigue': fatigue[0] if fatigue else None,
+            'breaks_today': breaks,
+            'daily_metrics': analytics[0] if analytics else None,
+            'recommendations': recommendations,
+            'preferences': prefs[0] if prefs else None
+        }
+
     # ==================== ANALYTICS ====================
     
+    @cached(ttl=10)
     def get_daily_metrics(self, user_id: int, target_date: Optional[str] = None) -> Dict:
         """Get daily metrics from database"""
         if target_date is None:
-            target_date = date.today().isoformat()
+            target_date = _today_iso()
         
         query = """
-            SELECT * FROM ProductivityAnalytics
+            SELECT UserID, Date, TotalWorkTime, TotalBreakTime,
+                   ProductivityScore, AverageFatigueLevel, BreakCompliance, FocusScore
+            FROM ProductivityAnalytics
             WHERE UserID = %s AND Date = %s
         """
         result = self.db.fetch_one(query, [user_id, target_date])
@@ -165,31 +394,25 @@ class DataService:
             'focus_score': 0
         }
     
+    @cached(ttl=30)
     def get_weekly_metrics(self, user_id: int) -> Dict:
         """Get weekly metrics from database"""
         query = """
-            SELECT 
-                SUM(TotalWorkTime) as total_work_time,
-                SUM(TotalBreakTime) as total_break_time,
-                AVG(ProductivityScore) as avg_productivity,
-                AVG(AverageFatigueLevel) as avg_fatigue,
-                AVG(BreakCompliance) as avg_compliance,
-                AVG(FocusScore) as avg_focus
+            SELECT
+                COALESCE(SUM(TotalWorkTime), 0) as total_work_time,
+                COALESCE(SUM(TotalBreakTime), 0) as total_break_time,
+                COALESCE(AVG(ProductivityScore), 0) as avg_productivity_score,
+                COALESCE(AVG(AverageFatigueLevel), 0) as avg_fatigue_level,
+                COALESCE(AVG(BreakCompliance), 0) as avg_compliance,
+                COALESCE(AVG(FocusScore), 0) as avg_focus_score
             FROM ProductivityAnalytics
             WHERE UserID = %s AND Date >= DATE_SUB(CURDATE(), INTERVAL 7 DAY)
         """
         result = self.db.fetch_one(query, [user_id])
-        
+
         if result:
-            return {
-                'total_work_time': result.get('total_work_time', 0) or 0,
-                'total_break_time': result.get('total_break_time', 0) or 0,
-                'avg_productivity_score': result.get('avg_productivity', 0) or 0,
-                'avg_fatigue_level': result.get('avg_fatigue', 0) or 0,
-                'avg_compliance': result.get('avg_compliance', 0) or 0,
-                'avg_focus_score': result.get('avg_focus', 0) or 0
-            }
-        
+            return dict(result)
+
         return {
             'total_work_time': 0,
             'total_break_time': 0,
@@ -201,57 +424,36 @@ class DataService:
     
     def upsert_daily_analytics(self, user_id: int, metrics: Dict) -> bool:
         """Insert or update daily analytics"""
+        metrics_cache.invalidate_user(user_id)
         try:
-            target_date = metrics.get('date', date.today().isoformat())
-            
-            # Check if exists
-            query_check = """
-                SELECT AnalyticsID FROM ProductivityAnalytics
-                WHERE UserID = %s AND Date = %s
+            target_date = metrics.get('date') or _today_iso()
+
+            # Single round-trip upsert; unique_user_date (UserID, Date)
+            # resolves whether this inserts or updates, with no race window
+            query = """
+                INSERT INTO ProductivityAnalytics
+                (UserID, Date, TotalWorkTime, TotalBreakTime, ProductivityScore, AverageFatigueLevel, BreakCompliance, FocusScore)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE
+                TotalWorkTime = VALUES(TotalWorkTime),
+                TotalBreakTime = VALUES(TotalBreakTime),
+                ProductivityScore = VALUES(ProductivityScore),
+                AverageFatigueLevel = VALUES(AverageFatigueLevel),
+                BreakCompliance = VALUES(BreakCompliance),
+                FocusScore = VALUES(FocusScore)
             """
-            existing = self.db.fetch_one(query_check, [user_id, target_date])
-            
-            if existing:
-                # Update
-                query = """
-                    UPDATE ProductivityAnalytics SET
-                    TotalWorkTime = %s,
-                    TotalBreakTime = %s,
-                    ProductivityScore = %s,
-                    AverageFatigueLevel = %s,
-                    BreakCompliance = %s,
-                    FocusScore = %s
-                    WHERE UserID = %s AND Date = %s
-                """
-                params = [
-                    metrics.get('total_work_time', 0),
-                    metrics.get('total_break_time', 0),
-                    metrics.get('productivity_score', 0),
-                    metrics.get('average_fatigue_level', 0),
-                    metrics.get('break_compliance_rate', 0),
-                    metrics.get('focus_score', 0),
-                    user_id,
-                    target_date
-                ]
-            else:
-                # Insert
-                query = """
-                    INSERT INTO ProductivityAnalytics
-                    (UserID, Date, TotalWorkTime, TotalBreakTime, ProductivityScore, AverageFatigueLevel, BreakCompliance, FocusScore)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                """
-                params = [
-                    user_id,
-                    target_date,
-                    metrics.get('total_work_time', 0),
-                    metrics.get('total_break_time', 0),
-                    metrics.get('productivity_score', 0),
-                    metrics.get('average_fatigue_level', 0),
-                    metrics.get('break_compliance_rate', 0),
-                    metrics.get('focus_score', 0)
-                ]
-            
-            return self.db.execute_query(query, params)
+            params = [
+                user_id,
+                target_date,
+                metrics.get('total_work_time', 0),
+                metrics.get('total_break_time', 0),
+                metrics.get('productivity_score', 0),
+                metrics.get('average_fatigue_level', 0),
+                metrics.get('break_compliance_rate', 0),
+                metrics.get('focus_score', 0)
+            ]
+
+            return bool(self.db.execute_query(query, params))
         except Exception as e:
             logger.error(f"Error upserting daily analytics: {e}")
             return False
@@ -260,6 +462,7 @@ class DataService:
     
     def log_recommendation(self, user_id: int, recommendation_data: Dict) -> bool:
         """Log recommendation"""
+        metrics_cache.invalidate_user(user_id)
         try:
             query = """
                 INSERT INTO Recommendations
@@ -273,15 +476,50 @@ class DataService:
                 recommendation_data.get('duration', 5),
                 recommendation_data.get('priority', 1)
             ]
+            self.db.update_current_state(user_id, 'LastRecommendation', {
+                'RecommendationType': params[1],
+                'Activity': params[2],
+                'Duration': params[3],
+                'Priority': params[4],
+                'Timestamp': datetime.now()
+            }, batch=True)
             return self.db.execute_query(query, params)
         except Exception as e:
             logger.error(f"Error logging recommendation: {e}")
             return False
     
+    def log_recommendations_bulk(self, user_id: int, recommendations: List[Dict]) -> bool:
+        """Log multiple recommendations in a single multi-row insert"""
+        if not recommendations:
+            return True
+        metrics_cache.invalidate_user(user_id)
+        try:
+            query = """
+                INSERT INTO Recommendations
+                (UserID, RecommendationType, Activity, Duration, Priority)
+                VALUES (%s, %s, %s, %s, %s)
+            """
+            params_seq = [
+                [
+                    user_id,
+                    rec.get('recommendation_type', 'Break'),
+                    rec.get('activity', ''),
+                    rec.get('duration', 5),
+                    rec.get('priority', 1)
+                ]
+                for rec in recommendations
+            ]
+            return self.db.execute_many(query, params_seq)
+        except Exception as e:
+            logger.error(f"Error logging recommendations in bulk: {e}")
+            return False
+
+    @cached(ttl=10)
     def get_latest_recommendations(self, user_id: int, limit: int = 5) -> List[Dict]:
         """Get latest recommendations"""
         query = """
-            SELECT * FROM Recommendations
+            SELECT RecommendationType, Activity, Duration, Priority, Timestamp
+            FROM Recommendations
             WHERE UserID = %s
             ORDER BY Timestamp DESC
             LIMIT %s
@@ -290,16 +528,30 @@ class DataService:
     
     # ==================== PERSONALIZATION ====================
     
+    @cached(ttl=30)
     def get_user_preferences(self, user_id: int) -> Optional[Dict]:
         """Get user preferences"""
         query = """
-            SELECT * FROM PersonalizationProfile
+            SELECT PreferredActivities, OptimalBreakTime, FatigueThreshold, BreakPreferences
+            FROM PersonalizationProfile
             WHERE UserID = %s
         """
-        return self.db.fetch_one(query, [user_id])
+        prefs = self.db.fetch_one(query, [user_id])
+        if prefs:
+            # Parse the JSON columns once here; the TTL cache then serves
+            # the decoded dict instead of re-parsing per dashboard tick
+            for key in ('PreferredActivities', 'BreakPreferences'):
+                value = prefs.get(key)
+                if isinstance(value, (str, bytes)) and value:
+                    try:
+                        prefs[key] = _json_loads(value)
+                    except ValueError:
+                        pass
+        return prefs
     
     def update_user_preferences(self, user_id: int, preferences: Dict) -> bool:
         """Update user preferences"""
+        metrics_cache.invalidate_user(user_id)
         try:
             query = """
                 UPDATE PersonalizationProfile SET
@@ -310,10 +562,10 @@ class DataService:
                 WHERE UserID = %s
             """
             params = [
-                json.dumps(preferences.get('preferred_activities', [])),
+                _json_dumps(preferences.get('preferred_activities', [])),
                 preferences.get('optimal_break_time', '09:00:00'),
                 preferences.get('fatigue_threshold', 0.7),
-                json.dumps(preferences.get('break_preferences', {})),
+                _json_dumps(preferences.get('break_preferences', {})),
                 user_id
             ]
             return self.db.execute_query(query, params)
@@ -322,13 +574,7 @@ class DataService:
             return False
 
 
-# Global instance
-data_service = None
-
-
+@lru_cache(maxsize=1)
 def get_data_service() -> DataService:
-    """Get or create data service instance"""
-    global data_service
-    if data_service is None:
-        data_service = DataService()
-    return data_service
+    """Get or create data service instance (idempotent singleton)"""
+    return DataService()
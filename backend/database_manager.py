@@ -8,12 +8,39 @@ import mysql.connector
 from mysql.connector import pooling, Error
 from typing import Optional, List, Dict, Any, Union
 from config.config import DATABASE_CONFIG
+from backend.batch_writer import BATCH_WRITES_ENABLED, get_batch_writer
+import random
 import threading
 import time
 from contextlib import contextmanager
+from datetime import datetime
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
+# MySQL errnos worth retrying: too many connections, lock wait timeout,
+# deadlock, server gone away, lost connection. Permanent errors (syntax,
+# constraint violations) fail fast instead of burning the retry budget.
+_RETRYABLE_ERRNOS = frozenset({1040, 1205, 1213, 2006, 2013})
+
+
+def _retry_delay(attempt: int, base: float = 0.1, cap: float = 0.4) -> float:
+    """Exponential backoff with jitter, keeping the total budget under ~1s"""
+    return min(cap, base * (2 ** attempt)) + random.uniform(0, 0.05)
+
+
+# Compact JSON for UserCurrentState snapshots; orjson when available
+try:
+    import orjson
+
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj, default=str).decode()
+except ImportError:
+    import json
+
+    def _json_dumps(obj) -> str:
+        return json.dumps(obj, separators=(',', ':'), default=str)
+
 
 class DatabaseManager:
     """Manages MySQL database connections and queries with connection pooling"""
@@ -23,7 +50,9 @@ class DatabaseManager:
         self.connection_pool = None
         self.pool_lock = threading.Lock()
         self.is_initialized = False
-        self._initialize_pool()
+        # Pool creation is deferred to the first get_connection() call so
+        # that importing this module (e.g. in a preloading WSGI master)
+        # never opens sockets that would be unsafely inherited by workers
     
     def _initialize_pool(self) -> bool:
         """Initialize connection pool"""
@@ -38,11 +67,19 @@ class DatabaseManager:
                 'user': self.config['user'],
                 'password': self.config['password'],
                 'charset': self.config.get('charset', 'utf8mb4'),
-                'autocommit': self.config.get('autocommit', True),
-                'sql_mode': 'TRADITIONAL'
+                'autocommit': self.config.get('autocommit', False),
+                'sql_mode': 'TRADITIONAL',
+                'use_pure': False
             }
-            
-            self.connection_pool = pooling.MySQLConnectionPool(**pool_config)
+
+            try:
+                self.connection_pool = pooling.MySQLConnectionPool(**pool_config)
+            except (ImportError, AttributeError, NotImplementedError):
+                # C extension not installed; fall back to the pure-Python
+                # driver (2-5x slower row materialization, but functional)
+                logger.info("mysql-connector C extension unavailable, using pure-Python driver")
+                pool_config['use_pure'] = True
+                self.connection_pool = pooling.MySQLConnectionPool(**pool_config)
             self.is_initialized = True
             logger.info(f"Connection pool initialized for database: {self.config['database']}")
             return True
@@ -55,34 +92,44 @@ class DatabaseManager:
     def get_connection(self):
         """Get a connection from the pool with automatic cleanup"""
         connection = None
-        connection_created = False
         try:
-            with self.pool_lock:
-                if not self.is_initialized:
-                    if not self._initialize_pool():
-                        raise Error("Failed to initialize connection pool")
-                    connection_created = True
-                
-                connection = self.connection_pool.get_connection()
-                
-            if connection:
-                # Only log when we actually create a new connection or pool
-                if connection_created:
-                    logger.info(f"Connected to MySQL database: {self.config['database']}")
-                yield connection
-            else:
-                raise Error("Failed to get connection from pool")
-                
+            # Double-checked init: steady-state calls read the flag without
+            # taking the lock; only the re-init branch serializes
+            if not self.is_initialized:
+                with self.pool_lock:
+                    if not self.is_initialized:
+                        if not self._initialize_pool():
+                            raise Error("Failed to initialize connection pool")
+
+            # MySQLConnectionPool is internally thread-safe, so checkout
+            # happens outside our lock
+            connection = self.connection_pool.get_connection()
+            yield connection
+
         except Error as e:
             logger.error(f"Database connection error: {e}")
-            # Try to reinitialize pool on connection error
-            with self.pool_lock:
-                self.is_initialized = False
+            # Try to reinitialize pool on connection error; a plain flag
+            # store is atomic under the GIL
+            self.is_initialized = False
             raise e
         finally:
-            if connection and connection.is_connected():
-                connection.close()
+            # close() just returns the connection to the pool; checking
+            # is_connected() first would cost a COM_PING round-trip per
+            # release, and the pool recycles dead connections itself
+            if connection is not None:
+                try:
+                    connection.close()
+                except Error:
+                    pass
     
+    @staticmethod
+    def _should_retry(e: Error, attempt: int, retries: int) -> bool:
+        """Back off and return True if the error is transient and budget remains"""
+        if attempt == retries - 1 or getattr(e, 'errno', None) not in _RETRYABLE_ERRNOS:
+            return False
+        time.sleep(_retry_delay(attempt))
+        return True
+
     def close_pool(self):
         """Close all connections in the pool"""
         try:
@@ -98,56 +145,96 @@ class DatabaseManager:
         for attempt in range(retries):
             try:
                 with self.get_connection() as connection:
+                    # Plain cursor per call: returning a pooled connection
+                    # resets the session (COM_RESET_CONNECTION), which
+                    # deallocates server-side prepared statements - so a
+                    # prepared cursor cached across checkouts would execute
+                    # a stale statement id on the next reuse and every
+                    # write on that connection would fail with errno 1243
                     cursor = connection.cursor()
                     try:
                         if params:
                             cursor.execute(query, params)
                         else:
                             cursor.execute(query)
-                        
+
                         connection.commit()
-                        
-                        # If it was an INSERT, return the ID
-                        if query.strip().upper().startswith('INSERT'):
+
+                        # If it was an INSERT, return the ID; inspect only a
+                        # bounded prefix instead of uppercasing the whole
+                        # statement on every write
+                        if query[:32].lstrip()[:6].upper() == 'INSERT':
                             last_id = cursor.lastrowid
                             return last_id if last_id else True
-                            
+
                         return True
                     finally:
                         cursor.close()
-                        
+
             except Error as e:
                 logger.error(f"Query execution failed (attempt {attempt + 1}/{retries}): {e}")
-                if attempt == retries - 1:
+                if not self._should_retry(e, attempt, retries):
                     return False
-                time.sleep(0.5)  # Brief delay before retry
         return False
     
-    def fetch_one(self, query: str, params: List = None, retries: int = 2) -> Optional[Dict]:
-        """Fetch a single row with connection pooling"""
+    def execute_many(self, query: str, params_seq: List[List], retries: int = 2) -> bool:
+        """Execute a query for many parameter sets in a single round-trip/transaction"""
+        if not params_seq:
+            return True
         for attempt in range(retries):
             try:
                 with self.get_connection() as connection:
-                    cursor = connection.cursor(dictionary=True)
+                    cursor = connection.cursor()
                     try:
-                        if params:
-                            cursor.execute(query, params)
-                        else:
-                            cursor.execute(query)
-                        
-                        result = cursor.fetchone()
-                        return result
+                        cursor.executemany(query, params_seq)
+                        connection.commit()
+                        return True
                     finally:
                         cursor.close()
-                        
+
+            except Error as e:
+                logger.error(f"Batch execution failed (attempt {attempt + 1}/{retries}): {e}")
+                if not self._should_retry(e, attempt, retries):
+                    return False
+        return False
+
+    @staticmethod
+    def _dict_cursor(connection):
+        """Get the cached buffered dict cursor for a pooled connection
+
+        Dict-cursor construction allocates row-factory machinery on every
+        call; pooled connections are long-lived, so one buffered cursor is
+        created per underlying connection and reused across checkouts.
+        Buffered mode drains each result set at execute time, so partial
+        fetches never leave unread rows behind.
+        """
+        raw = getattr(connection, '_cnx', connection)
+        cursor = getattr(raw, '_cached_dict_cursor', None)
+        if cursor is None:
+            cursor = connection.cursor(dictionary=True, buffered=True)
+            raw._cached_dict_cursor = cursor
+        return cursor
+
+    def fetch_one(self, query: str, params: List = None, retries: int = 2) -> Optional[Dict]:
+        """Fetch a single row with connection pooling"""
+        for attempt in range(retries):
+            try:
+                with self.get_connection() as connection:
+                    cursor = self._dict_cursor(connection)
+                    if params:
+                        cursor.execute(query, params)
+                    else:
+                        cursor.execute(query)
+
+                    return cursor.fetchone()
+
             except Error as e:
                 if attempt == 0 or 'timeout' in str(e).lower():
                     logger.warning(f"Fetch one failed (attempt {attempt + 1}/{retries}): {e}")
                 else:
                     logger.error(f"Fetch one failed (attempt {attempt + 1}/{retries}): {e}")
-                if attempt == retries - 1:
+                if not self._should_retry(e, attempt, retries):
                     return None
-                time.sleep(0.3)  # Brief delay before retry
         return None
     
     def fetch_all(self, query: str, params: List = None, retries: int = 2) -> List[Dict]:
@@ -155,33 +242,110 @@ class DatabaseManager:
         for attempt in range(retries):
             try:
                 with self.get_connection() as connection:
-                    cursor = connection.cursor(dictionary=True)
-                    try:
-                        if params:
-                            cursor.execute(query, params)
-                        else:
-                            cursor.execute(query)
-                        
-                        result = cursor.fetchall()
-                        return result if result else []
-                    finally:
-                        cursor.close()
-                     
+                    cursor = self._dict_cursor(connection)
+                    if params:
+                        cursor.execute(query, params)
+                    else:
+                        cursor.execute(query)
+
+                    result = cursor.fetchall()
+                    return result if result else []
+
             except Error as e:
                 if attempt == 0 or 'timeout' in str(e).lower():
                     logger.warning(f"Fetch all failed (attempt {attempt + 1}/{retries}): {e}")
                 else:
                     logger.error(f"Fetch all failed (attempt {attempt + 1}/{retries}): {e}")
-                if attempt == retries - 1:
+                if not self._should_retry(e, attempt, retries):
                     return []
-                time.sleep(0.3)  # Brief delay before retry
         return []
     
+    # Upsert for the per-minute ActivityRollup buckets that back
+    # get_activity_summary; entering samples are added in place
+    ROLLUP_UPSERT = """
+        INSERT INTO ActivityRollup
+        (UserID, BucketTS, Clicks, Presses, IdleTime, ScreenTime, SampleCount)
+        VALUES (%s, %s, %s, %s, %s, %s, 1)
+        ON DUPLICATE KEY UPDATE
+        Clicks = Clicks + VALUES(Clicks),
+        Presses = Presses + VALUES(Presses),
+        IdleTime = IdleTime + VALUES(IdleTime),
+        ScreenTime = ScreenTime + VALUES(ScreenTime),
+        SampleCount = SampleCount + 1
+    """
+
+    def fetch_multi(self, sql: str, retries: int = 2) -> Optional[List[List[Dict]]]:
+        """Execute a multi-statement batch and return one row list per statement
+
+        Sends all statements in a single round-trip; the caller is
+        responsible for any parameter interpolation, so only trusted
+        values (e.g. validated integer IDs) may be embedded in sql.
+        """
+        for attempt in range(retries):
+            try:
+                with self.get_connection() as connection:
+                    # multi=True needs its own cursor; the cached one would
+                    # be left mid-iteration on error
+                    cursor = connection.cursor(dictionary=True)
+                    try:
+                        result_sets = []
+                        for result in cursor.execute(sql, multi=True):
+                            result_sets.append(result.fetchall() if result.with_rows else [])
+                        return result_sets
+                    finally:
+                        cursor.close()
+
+            except Error as e:
+                logger.error(f"Multi fetch failed (attempt {attempt + 1}/{retries}): {e}")
+                if not self._should_retry(e, attempt, retries):
+                    return None
+        return None
+
+    def fetch_iter(self, query: str, params: List = None, batch_size: int = 512):
+        """Stream rows with an unbuffered cursor, yielding dicts
+
+        Keeps memory bounded by batch_size instead of buffering the whole
+        result set. The pooled connection is held until the generator is
+        exhausted or closed, so wrap usage in contextlib.closing (or fully
+        consume it) and prefer fetch_all for small bounded reads.
+        """
+        with self.get_connection() as connection:
+            cursor = connection.cursor(dictionary=True, buffered=False)
+            try:
+                if params:
+                    cursor.execute(query, params)
+                else:
+                    cursor.execute(query)
+
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    yield from rows
+            finally:
+                cursor.close()
+
+    _STATE_COLUMNS = frozenset({'LastActivity', 'LastFatigue', 'LastRecommendation'})
+
+    def update_current_state(self, user_id: int, column: str, payload: Dict,
+                             batch: bool = False) -> bool:
+        """Upsert one latest-per-user snapshot column in UserCurrentState"""
+        if column not in self._STATE_COLUMNS:
+            raise ValueError(f"Unknown state column: {column}")
+        query = (
+            f"INSERT INTO UserCurrentState (UserID, {column}) VALUES (%s, %s) "
+            f"ON DUPLICATE KEY UPDATE {column} = VALUES({column})"
+        )
+        params = [user_id, _json_dumps(payload)]
+        if batch and BATCH_WRITES_ENABLED:
+            return get_batch_writer().enqueue(query, params)
+        return bool(self.execute_query(query, params))
+
     def log_activity(self, user_id: int, activity_data: Dict) -> bool:
         """Log user activity with improved error handling"""
         try:
             query = """
-                INSERT INTO ActivityLog 
+                INSERT INTO ActivityLog
                 (UserID, MouseActivity, KeyboardActivity, ScreenInteractionTime, IdlePeriod, ApplicationName)
                 VALUES (%s, %s, %s, %s, %s, %s)
             """
@@ -193,6 +357,31 @@ class DatabaseManager:
                 activity_data.get('idle_time', 0),
                 activity_data.get('app_name', 'Unknown')
             ]
+            bucket_ts = datetime.now().replace(second=0, microsecond=0)
+            rollup_params = [
+                user_id,
+                bucket_ts,
+                params[1],  # clicks
+                params[2],  # presses
+                params[4],  # idle
+                params[3]   # screen time
+            ]
+            # Column-cased snapshot so reads match the ActivityLog row shape
+            state = {
+                'Timestamp': datetime.now(),
+                'MouseActivity': params[1],
+                'KeyboardActivity': params[2],
+                'ScreenInteractionTime': params[3],
+                'IdlePeriod': params[4],
+                'ApplicationName': params[5]
+            }
+            if BATCH_WRITES_ENABLED:
+                writer = get_batch_writer()
+                writer.enqueue(self.ROLLUP_UPSERT, rollup_params)
+                self.update_current_state(user_id, 'LastActivity', state, batch=True)
+                return writer.enqueue(query, params)
+            self.execute_query(self.ROLLUP_UPSERT, rollup_params)
+            self.update_current_state(user_id, 'LastActivity', state)
             return self.execute_query(query, params)
         except Exception as e:
             logger.error(f"Error logging activity: {e}")
@@ -216,6 +405,20 @@ class DatabaseManager:
                 fatigue_data.get('webcam_data_used', False),
                 fatigue_data.get('alert_generated', False)
             ]
+            # Column-cased snapshot so reads match the FatigueDetection row shape
+            state = {
+                'FatigueScore': params[1],
+                'EyeStrainLevel': params[2],
+                'BlinkRate': params[3],
+                'PostureScore': params[4],
+                'FacialExpression': params[5],
+                'AlertGenerated': params[7],
+                'Timestamp': datetime.now()
+            }
+            if BATCH_WRITES_ENABLED:
+                self.update_current_state(user_id, 'LastFatigue', state, batch=True)
+                return get_batch_writer().enqueue(query, params)
+            self.update_current_state(user_id, 'LastFatigue', state)
             return self.execute_query(query, params)
         except Exception as e:
             logger.error(f"Error logging fatigue: {e}")
@@ -283,6 +486,46 @@ class DatabaseManager:
             logger.error(f"Error getting daily analytics: {e}")
             return None
     
+    # High-volume log tables and their time columns, oldest-first purge order
+    RETENTION_TABLES = (
+        ('ActivityLog', 'Timestamp'),
+        ('FatigueDetection', 'Timestamp'),
+        ('ActivityRollup', 'BucketTS'),
+    )
+
+    def purge_old_logs(self, retention_days: int = 30) -> bool:
+        """Delete log rows older than the retention window
+
+        ActivityLog and FatigueDetection grow without bound and the hot
+        queries only ever look at recent ranges; purging keeps the
+        (UserID, Timestamp) index scans bounded. Deletes run in LIMIT
+        batches so a large backlog never holds locks for long.
+        """
+        ok = True
+        for table, ts_column in self.RETENTION_TABLES:
+            query = (
+                f"DELETE FROM {table} "
+                f"WHERE {ts_column} < DATE_SUB(NOW(), INTERVAL %s DAY) "
+                f"LIMIT 10000"
+            )
+            # Repeat until the batch comes back empty; bounded to keep a
+            # misconfigured retention from looping forever
+            for _ in range(100):
+                with self.get_connection() as connection:
+                    cursor = connection.cursor()
+                    try:
+                        cursor.execute(query, [retention_days])
+                        connection.commit()
+                        if cursor.rowcount < 10000:
+                            break
+                    except Error as e:
+                        logger.error(f"Retention purge failed for {table}: {e}")
+                        ok = False
+                        break
+                    finally:
+                        cursor.close()
+        return ok
+
     def health_check(self) -> bool:
         """Check if database connection is healthy"""
         try:
@@ -315,13 +558,7 @@ class DatabaseManager:
             return {"status": "error", "error": str(e), "is_initialized": self.is_initialized}
 
 
-# Global instance
-db_manager = None
-
-
+@lru_cache(maxsize=1)
 def get_database_manager() -> DatabaseManager:
-    """Get or create database manager instance"""
-    global db_manager
-    if db_manager is None:
-        db_manager = DatabaseManager()
-    return db_manager
+    """Get or create database manager instance (idempotent singleton)"""
+    return DatabaseManager()
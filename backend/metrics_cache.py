@@ -0,0 +1,76 @@
+"""
+In-process TTL cache for hot DataService read paths
+Dashboard polling re-runs the same SQL aggregations every few seconds;
+caching them briefly trades a little freshness for most of the DB load
+"""
+
+import logging
+import os
+import threading
+import time
+from functools import wraps
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+CACHE_ENABLED = os.environ.get('METRICS_CACHE_ENABLED', '1') != '0'
+DEFAULT_TTL = float(os.environ.get('METRICS_CACHE_TTL_SECONDS', '10'))
+
+
+class TTLCache:
+    """Thread-safe TTL cache keyed by (method, user_id, args)"""
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get_or_set(self, key, ttl: float, loader: Callable[[], Any]) -> Any:
+        """Return the cached value for key, calling loader on miss/expiry"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                return entry[1]
+        # Load outside the lock so a slow query doesn't serialize all readers;
+        # concurrent misses may each run the loader once, which is harmless
+        value = loader()
+        with self._lock:
+            self._entries[key] = (now + ttl, value)
+        return value
+
+    def invalidate_user(self, user_id: int):
+        """Drop all cached entries for a user (called after writes)"""
+        with self._lock:
+            stale = [key for key in self._entries if key[1] == user_id]
+            for key in stale:
+                del self._entries[key]
+
+    def clear(self):
+        """Drop all cached entries"""
+        with self._lock:
+            self._entries.clear()
+
+
+# Shared instance used by DataService; write paths call invalidate_user on it
+metrics_cache = TTLCache()
+
+
+def cached(ttl: Optional[float] = None):
+    """Cache a read method by (method name, user_id, extra args)
+
+    The wrapped method must take user_id as its first positional argument
+    so invalidate_user() can find its entries after a write.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(self, user_id, *args, **kwargs):
+            if not CACHE_ENABLED:
+                return func(self, user_id, *args, **kwargs)
+            key = (func.__name__, user_id, args, tuple(sorted(kwargs.items())))
+            entry_ttl = DEFAULT_TTL if ttl is None else ttl
+            return metrics_cache.get_or_set(
+                key, entry_ttl,
+                lambda: func(self, user_id, *args, **kwargs)
+            )
+        return wrapper
+    return decorator
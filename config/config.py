@@ -4,10 +4,16 @@ Load sensitive data from environment variables
 """
 import os
 from datetime import timedelta
+from types import MappingProxyType
 from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
+# Load environment variables from the project .env, resolved relative to
+# this file so launching from any working directory finds it; skip the
+# file parse entirely when there is no .env (e.g. production sets real
+# environment variables)
+_ENV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '.env')
+if os.path.exists(_ENV_PATH):
+    load_dotenv(_ENV_PATH)
 
 # ==================== DATABASE CONFIGURATION (MYSQL - XAMPP) ====================
 DATABASE_CONFIG = {
@@ -17,7 +23,9 @@ DATABASE_CONFIG = {
     'user': os.getenv('DB_USER', 'root'),
     'password': os.getenv('DB_PASSWORD', ''),
     'charset': 'utf8mb4',
-    'autocommit': True,
+    # Writes commit explicitly (once per statement or batch); autocommit
+    # would force a commit/fsync per row inside executemany flushes
+    'autocommit': False,
 }
 
 # ==================== APPLICATION SETTINGS ====================
@@ -59,6 +67,7 @@ ACTIVITY_CONFIG = {
     'monitor_interval': 5,  # seconds
     'idle_threshold': 300,  # seconds (5 minutes)
     'low_activity_threshold': 50,  # clicks/keystrokes per minute
+    'capture_counts': True,  # install OS input hooks for click/keystroke counts
     'log_activity': True,
     'activity_buffer_size': 1000,
 }
@@ -156,6 +165,25 @@ elif os.environ.get('ENVIRONMENT') == 'production':
     LOGGING_CONFIG['log_level'] = 'WARNING'
     SECURITY_CONFIG['enable_encryption'] = True
 
+# ==================== FREEZE ====================
+# Read-only views: every value is resolved by this point (env overrides
+# included), and modules cache entries into attributes at init - a silent
+# runtime mutation would diverge from those cached copies
+DATABASE_CONFIG = MappingProxyType(DATABASE_CONFIG)
+APP_CONFIG = MappingProxyType(APP_CONFIG)
+BREAK_CONFIG = MappingProxyType(BREAK_CONFIG)
+FATIGUE_CONFIG = MappingProxyType(FATIGUE_CONFIG)
+ACTIVITY_CONFIG = MappingProxyType(ACTIVITY_CONFIG)
+ML_CONFIG = MappingProxyType(ML_CONFIG)
+PERSONALIZATION_CONFIG = MappingProxyType(PERSONALIZATION_CONFIG)
+RECOMMENDATION_CONFIG = MappingProxyType(RECOMMENDATION_CONFIG)
+LOGGING_CONFIG = MappingProxyType(LOGGING_CONFIG)
+NOTIFICATION_CONFIG = MappingProxyType(NOTIFICATION_CONFIG)
+FILE_PATHS = MappingProxyType(FILE_PATHS)
+SECURITY_CONFIG = MappingProxyType(SECURITY_CONFIG)
+ANALYTICS_CONFIG = MappingProxyType(ANALYTICS_CONFIG)
+API_CONFIG = MappingProxyType(API_CONFIG)
+
 # ==================== CONSTANTS ====================
 BREAK_TYPES = ['micro', 'regular', 'long', 'forced']
 ACTIVITY_TYPES = ['keyboard', 'mouse', 'screen_interaction', 'idle']
@@ -35,6 +35,31 @@ CREATE TABLE ActivityLog (
     INDEX idx_userid_timestamp (UserID, Timestamp)
 );
 
+-- Per-minute rollup of ActivityLog, maintained by the writers; bounds
+-- activity summaries to ~60 rows per hour regardless of sampling rate
+CREATE TABLE ActivityRollup (
+    UserID INT NOT NULL,
+    BucketTS TIMESTAMP NOT NULL,
+    Clicks INT DEFAULT 0,
+    Presses INT DEFAULT 0,
+    IdleTime INT DEFAULT 0,
+    ScreenTime INT DEFAULT 0,
+    SampleCount INT DEFAULT 0,
+    PRIMARY KEY (UserID, BucketTS),
+    FOREIGN KEY (UserID) REFERENCES Users(UserID) ON DELETE CASCADE
+);
+
+-- Latest-per-user snapshots maintained on write; "current state" reads
+-- become a single primary-key lookup instead of ORDER BY ... LIMIT 1
+CREATE TABLE UserCurrentState (
+    UserID INT PRIMARY KEY,
+    LastActivity JSON NULL,
+    LastFatigue JSON NULL,
+    LastRecommendation JSON NULL,
+    UpdatedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    FOREIGN KEY (UserID) REFERENCES Users(UserID) ON DELETE CASCADE
+);
+
 -- Fatigue Detection Data Table
 CREATE TABLE FatigueDetection (
     FatigueID INT PRIMARY KEY AUTO_INCREMENT,
@@ -62,7 +87,8 @@ CREATE TABLE BreakRecords (
     Reason VARCHAR(255),
     ComplianceStatus VARCHAR(20) DEFAULT 'Pending',
     FOREIGN KEY (UserID) REFERENCES Users(UserID) ON DELETE CASCADE,
-    INDEX idx_userid_starttime (UserID, BreakStartTime)
+    INDEX idx_userid_starttime (UserID, BreakStartTime),
+    INDEX idx_userid_compliance (UserID, ComplianceStatus, BreakStartTime)
 );
 
 -- Recommendations Table
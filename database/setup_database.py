@@ -6,6 +6,7 @@ Initializes MySQL database and creates all required tables
 import mysql.connector
 from mysql.connector import Error
 import logging
+import re
 import sys
 import os
 
@@ -22,6 +23,7 @@ DB_CONFIG = {
     'port': 3306,
     'user': 'root',
     'password': '',  # XAMPP default is empty password
+    'use_pure': False,  # C extension connector; faster wire handling
 }
 
 DB_NAME = 'ai_microbreak_system'
@@ -29,124 +31,103 @@ DB_NAME = 'ai_microbreak_system'
 # SQL schema file path
 SCHEMA_FILE = os.path.join(os.path.dirname(__file__), 'schema.sql')
 
+# Precompiled once: strip '--' comments and the CREATE DATABASE/USE
+# prelude in one pass each instead of scanning the schema line by line
+_COMMENT_RE = re.compile(r'--[^\n]*')
+_PRELUDE_RE = re.compile(
+    r'^\s*(CREATE DATABASE|USE)[^;]*;', re.IGNORECASE | re.MULTILINE
+)
+
 
-def test_connection():
-    """Test MySQL connection"""
+def connect():
+    """Open the setup connection - one per run, shared by every step
+
+    The TCP + auth handshake dominates these short setup statements, so
+    the steps reuse a single connection instead of reconnecting each time.
+    """
     try:
-        conn = mysql.connector.connect(
-            host=DB_CONFIG['host'],
-            port=DB_CONFIG['port'],
-            user=DB_CONFIG['user'],
-            password=DB_CONFIG['password']
-        )
-        conn.close()
+        try:
+            conn = mysql.connector.connect(**DB_CONFIG)
+        except (Error, AttributeError, ImportError):
+            # C extension not installed; fall back to the pure-Python path
+            conn = mysql.connector.connect(**{**DB_CONFIG, 'use_pure': True})
         logger.info("[OK] MySQL connection successful")
-        return True
+        return conn
     except Error as e:
         logger.error(f"[ERROR] MySQL connection failed: {e}")
         logger.error("Make sure XAMPP MySQL is running")
-        return False
+        return None
 
 
-def create_database():
+def create_database(conn):
     """Create the database if it doesn't exist"""
     try:
-        conn = mysql.connector.connect(
-            host=DB_CONFIG['host'],
-            port=DB_CONFIG['port'],
-            user=DB_CONFIG['user'],
-            password=DB_CONFIG['password']
-        )
         cursor = conn.cursor()
-        
+
         # Create database
         cursor.execute(f"CREATE DATABASE IF NOT EXISTS {DB_NAME}")
         logger.info(f"[OK] Database '{DB_NAME}' ready")
-        
+
         cursor.close()
-        conn.close()
         return True
     except Error as e:
         logger.error(f"[ERROR] Failed to create database: {e}")
         return False
 
 
-def run_schema():
+def run_schema(conn):
     """Execute the SQL schema file to create tables"""
     try:
         if not os.path.exists(SCHEMA_FILE):
             logger.error(f"[ERROR] Schema file not found: {SCHEMA_FILE}")
             return False
-        
-        conn = mysql.connector.connect(
-            host=DB_CONFIG['host'],
-            port=DB_CONFIG['port'],
-            user=DB_CONFIG['user'],
-            password=DB_CONFIG['password']
-        )
+
         cursor = conn.cursor()
-        
+
         # First, create and use database
         cursor.execute(f"CREATE DATABASE IF NOT EXISTS {DB_NAME}")
         cursor.execute(f"USE {DB_NAME}")
-        
+
         # Read schema file
         with open(SCHEMA_FILE, 'r', encoding='utf-8') as f:
             schema_content = f.read()
-        
-        # Remove comments and split statements
-        lines = schema_content.split('\n')
-        current_statement = []
-        
-        for line in lines:
-            # Remove line comments
-            if '--' in line:
-                line = line[:line.index('--')]
-            
-            line = line.strip()
-            if line:
-                current_statement.append(line)
-            
-            # Execute when we hit a semicolon
-            if line.endswith(';'):
-                full_statement = ' '.join(current_statement)
-                
-                if not full_statement.startswith('CREATE DATABASE') and not full_statement.startswith('USE '):
-                    try:
-                        cursor.execute(full_statement)
-                    except Error as e:
-                        if 'already exists' in str(e).lower():
-                            pass  # Table already exists, skip
-                        elif 'no database selected' in str(e).lower():
-                            pass  # Database switched, continue
-                        else:
-                            logger.warning(f"[WARN] SQL Warning: {e}")
-                
-                current_statement = []
-        
+
+        # Strip comments and the CREATE DATABASE/USE prelude (issued
+        # above), then execute statement by statement: a rerun against an
+        # existing database skips each already-created table (errno 1050)
+        # and still creates any tables added to the schema since, which a
+        # single multi-statement batch would abort on at the first error
+        schema_content = _COMMENT_RE.sub('', schema_content)
+        schema_content = _PRELUDE_RE.sub('', schema_content)
+
+        for statement in schema_content.split(';'):
+            statement = statement.strip()
+            if not statement:
+                continue
+            try:
+                cursor.execute(statement)
+            except Error as e:
+                if getattr(e, 'errno', None) == 1050:  # table already exists
+                    logger.info("[INFO] Table already exists, skipping")
+                else:
+                    logger.warning(f"[WARN] SQL Warning: {e}")
+
         conn.commit()
         logger.info("[OK] Database schema created successfully")
-        
+
         cursor.close()
-        conn.close()
         return True
     except Error as e:
         logger.error(f"[ERROR] Failed to execute schema: {e}")
         return False
 
 
-def create_test_user():
+def create_test_user(conn):
     """Create a test user for development"""
     try:
-        conn = mysql.connector.connect(
-            host=DB_CONFIG['host'],
-            port=DB_CONFIG['port'],
-            database=DB_NAME,
-            user=DB_CONFIG['user'],
-            password=DB_CONFIG['password']
-        )
         cursor = conn.cursor()
-        
+        cursor.execute(f"USE {DB_NAME}")
+
         # Check if test user already exists
         cursor.execute("SELECT UserID FROM Users WHERE Username = 'testuser'")
         if cursor.fetchone():
@@ -160,9 +141,8 @@ def create_test_user():
             cursor.execute(query, ('testuser', 'test@example.com', 'hashed_password_here', 5, 30))
             conn.commit()
             logger.info("[OK] Test user created successfully")
-        
+
         cursor.close()
-        conn.close()
         return True
     except Error as e:
         logger.error(f"[ERROR] Failed to create test user: {e}")
@@ -174,29 +154,41 @@ def main():
     print("=" * 60)
     print("AI Micro Break System - Database Setup")
     print("=" * 60)
-    
+
+    print("\nTesting MySQL connection...")
+    conn = connect()
+    if conn is None:
+        print("Failed on: Testing MySQL connection")
+        print("\nMake sure:")
+        print("1. XAMPP is installed")
+        print("2. MySQL service is running in XAMPP Control Panel")
+        print("3. Database password is empty (default for XAMPP)")
+        return False
+
     steps = [
-        ("Testing MySQL connection", test_connection),
         ("Creating database", create_database),
         ("Running schema", run_schema),
         ("Creating test user", create_test_user),
     ]
-    
-    success_count = 0
-    for step_name, step_func in steps:
-        print(f"\n{step_name}...")
-        if step_func():
-            success_count += 1
-        else:
-            print(f"Failed on: {step_name}")
-            print("\nMake sure:")
-            print("1. XAMPP is installed")
-            print("2. MySQL service is running in XAMPP Control Panel")
-            print("3. Database password is empty (default for XAMPP)")
-            return False
-    
+
+    success_count = 1  # connection test
+    try:
+        for step_name, step_func in steps:
+            print(f"\n{step_name}...")
+            if step_func(conn):
+                success_count += 1
+            else:
+                print(f"Failed on: {step_name}")
+                print("\nMake sure:")
+                print("1. XAMPP is installed")
+                print("2. MySQL service is running in XAMPP Control Panel")
+                print("3. Database password is empty (default for XAMPP)")
+                return False
+    finally:
+        conn.close()
+
     print("\n" + "=" * 60)
-    print(f"Setup Complete! ({success_count}/{len(steps)} steps successful)")
+    print(f"Setup Complete! ({success_count}/{len(steps) + 1} steps successful)")
     print("=" * 60)
     print("\nYou can now run: python app.py")
     return True
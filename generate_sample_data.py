@@ -6,11 +6,15 @@ Populates database with realistic sample data for testing
 import logging
 from datetime import datetime, timedelta
 from backend.data_service import get_data_service
-import random
+import numpy as np
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# One vectorized draw per column instead of per-row random.* calls;
+# .tolist() hands back native Python scalars for the DB driver
+rng = np.random.default_rng()
+
 def generate_sample_data():
     """Generate sample data for user 1"""
     try:
@@ -18,60 +22,84 @@ def generate_sample_data():
         user_id = 1
         
         print("Generating sample activity data...")
-        
-        # Generate activity logs for the last 8 hours
-        for hour in range(8, 0, -1):
-            timestamp = datetime.now() - timedelta(hours=hour)
-            activity_data = {
-                'mouse_clicks': random.randint(20, 100),
-                'keyboard_presses': random.randint(50, 200),
-                'screen_time': random.randint(300, 600),
-                'idle_time': random.randint(10, 60),
-                'app_name': random.choice(['Visual Studio Code', 'Chrome', 'Word', 'Excel', 'Slack'])
+
+        # Generate activity logs for the last 8 hours, inserted in one batch
+        apps = ['Visual Studio Code', 'Chrome', 'Word', 'Excel', 'Slack']
+        activity_rows = [
+            {
+                'mouse_clicks': clicks,
+                'keyboard_presses': presses,
+                'screen_time': screen,
+                'idle_time': idle,
+                'app_name': app
             }
-            data_service.log_activity(user_id, activity_data)
-            print(f"  [OK] Activity logged for {hour} hours ago")
-        
+            for clicks, presses, screen, idle, app in zip(
+                rng.integers(20, 101, 8).tolist(),
+                rng.integers(50, 201, 8).tolist(),
+                rng.integers(300, 601, 8).tolist(),
+                rng.integers(10, 61, 8).tolist(),
+                rng.choice(apps, 8).tolist()
+            )
+        ]
+        data_service.log_activities_bulk(user_id, activity_rows)
+        print(f"  [OK] {len(activity_rows)} activity entries logged")
+
         print("\nGenerating sample fatigue data...")
-        
-        # Generate fatigue detection logs
-        for i in range(8):
-            fatigue_data = {
-                'fatigue_score': random.uniform(0.3, 0.8),
-                'eye_strain_level': random.randint(2, 7),
-                'blink_rate': random.uniform(12, 20),
-                'posture_score': round(random.uniform(0.4, 0.9), 2),
-                'facial_expression': random.choice(['alert', 'neutral', 'tired']),
+
+        # Generate fatigue detection logs in one batch
+        fatigue_rows = [
+            {
+                'fatigue_score': score,
+                'eye_strain_level': strain,
+                'blink_rate': blink,
+                'posture_score': round(posture, 2),
+                'facial_expression': expression,
                 'webcam_data_used': True,
-                'alert_generated': random.choice([True, False])
+                'alert_generated': bool(alert)
             }
-            data_service.log_fatigue(user_id, fatigue_data)
-            print(f"  [OK] Fatigue entry {i+1} logged")
-        
+            for score, strain, blink, posture, expression, alert in zip(
+                rng.uniform(0.3, 0.8, 8).tolist(),
+                rng.integers(2, 8, 8).tolist(),
+                rng.uniform(12, 20, 8).tolist(),
+                rng.uniform(0.4, 0.9, 8).tolist(),
+                rng.choice(['alert', 'neutral', 'tired'], 8).tolist(),
+                rng.integers(0, 2, 8).tolist()
+            )
+        ]
+        data_service.log_fatigue_bulk(user_id, fatigue_rows)
+        print(f"  [OK] {len(fatigue_rows)} fatigue entries logged")
+
         print("\nGenerating sample break records...")
-        
-        # Generate break records
-        for i in range(3):
-            break_data = {
-                'duration': random.choice([3, 5, 10]),
-                'break_type': random.choice(['micro', 'regular', 'long']),
-                'reason': random.choice(['Eye strain', 'Fatigue', 'Scheduled', 'High activity']),
-                'compliance_status': random.choice(['Completed', 'Skipped'])
+
+        # Generate break records in one batch
+        break_rows = [
+            {
+                'duration': duration,
+                'break_type': break_type,
+                'reason': reason,
+                'compliance_status': status
             }
-            data_service.log_break(user_id, break_data)
-            print(f"  [OK] Break record {i+1} logged")
-        
+            for duration, break_type, reason, status in zip(
+                rng.choice([3, 5, 10], 3).tolist(),
+                rng.choice(['micro', 'regular', 'long'], 3).tolist(),
+                rng.choice(['Eye strain', 'Fatigue', 'Scheduled', 'High activity'], 3).tolist(),
+                rng.choice(['Completed', 'Skipped'], 3).tolist()
+            )
+        ]
+        data_service.log_breaks_bulk(user_id, break_rows)
+        print(f"  [OK] {len(break_rows)} break records logged")
+
         print("\nGenerating daily analytics...")
         
         # Generate daily analytics
         daily_metrics = {
             'date': datetime.now().date().isoformat(),
-            'total_work_time': random.randint(300, 480),  # 5-8 hours
-            'total_break_time': random.randint(15, 45),   # 15-45 minutes
-            'productivity_score': random.randint(60, 90),
-            'average_fatigue_level': round(random.uniform(0.4, 0.7), 2),
-            'break_compliance_rate': round(random.uniform(0.6, 0.95), 2),
-            'focus_score': random.randint(70, 95)
+            'total_work_time': int(rng.integers(300, 481)),  # 5-8 hours
+            'total_break_time': int(rng.integers(15, 46)),   # 15-45 minutes
+            'productivity_score': int(rng.integers(60, 91)),
+            'average_fatigue_level': round(float(rng.uniform(0.4, 0.7)), 2),
+            'break_compliance_rate': round(float(rng.uniform(0.6, 0.95)), 2),
+            'focus_score': int(rng.integers(70, 96))
         }
         data_service.upsert_daily_analytics(user_id, daily_metrics)
         print("  [OK] Daily analytics computed and saved")
@@ -5,16 +5,30 @@ Monitors mouse, keyboard, screen interaction, and idle periods
 
 import time
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Dict, Tuple
-from pynput import mouse, keyboard
-import psutil
+import numpy as np
 import threading
-from collections import deque
+from functools import lru_cache
 from config.config import ACTIVITY_CONFIG
 
 logger = logging.getLogger(__name__)
 
+# Cached second-resolution ISO timestamp, same tuple-swap scheme as the
+# backend's iso_now: readers see either the old pair or the new pair
+_ts_cache = (0, '')
+
+
+def _iso_now() -> str:
+    """Return the current local time as an ISO string, cached per second"""
+    global _ts_cache
+    seconds = int(time.time())
+    cached_seconds, cached_iso = _ts_cache
+    if seconds != cached_seconds:
+        cached_iso = datetime.fromtimestamp(seconds).isoformat()
+        _ts_cache = (seconds, cached_iso)
+    return cached_iso
+
 
 class ActivityMonitor:
     """Monitors user activity patterns with thread safety"""
@@ -24,46 +38,96 @@ class ActivityMonitor:
         self.keyboard_presses = 0
         self.total_active_seconds = 0
         self.total_idle_seconds = 0
-        self.last_activity_time = datetime.now()
         self.start_time = datetime.now()
-        self.is_monitoring = False
-        self.activity_buffer = deque(maxlen=ACTIVITY_CONFIG['activity_buffer_size'])
-        self.listener_thread = None
         self.monitor_interval = ACTIVITY_CONFIG['monitor_interval']
         self.idle_threshold = ACTIVITY_CONFIG['idle_threshold']
+        self.low_activity_threshold = ACTIVITY_CONFIG['low_activity_threshold']
+        # Wall/monotonic anchor pair: event callbacks store a cheap
+        # monotonic float and the ISO wall time is reconstructed on demand
+        self._start_wall = self.start_time
+        self._start_mono = time.monotonic()
+        self._last_activity_mono = self._start_mono
+        # Idle check becomes one float compare against a deadline pushed
+        # forward by each event, instead of subtract-and-compare per query
+        self._idle_deadline_mono = self._start_mono + self.idle_threshold
+        self.is_monitoring = False
+        # Struct-of-arrays ring buffer: preallocated numeric columns are an
+        # order of magnitude smaller than a deque of per-sample dicts and
+        # let analytics aggregate with vectorized ufuncs instead of loops
+        size = ACTIVITY_CONFIG['activity_buffer_size']
+        self._buf_size = size
+        self._buf_ts = np.empty(size, np.int64)  # epoch seconds
+        self._buf_clicks = np.empty(size, np.int32)
+        self._buf_presses = np.empty(size, np.int32)
+        self._buf_idle = np.empty(size, np.int32)
+        self._buf_screen = np.empty(size, np.int32)
+        self._buf_idx = 0  # total samples taken; write slot is idx % size
+        # (expiry_mono, dict) pair; swapped atomically under the GIL
+        self._summary_cache = (0.0, None)
+        # Rebuilds mutate this one dict in place rather than allocating a
+        # fresh dict-of-9 per call; callers must dict() it to retain a
+        # snapshot across calls
+        self._summary_buf = {
+            'mouse_clicks': 0,
+            'keyboard_presses': 0,
+            'idle_time': 0,
+            'is_idle': False,
+            'activity_level': 0.0,
+            'last_activity': '',
+            'screen_time': 0,
+            'buffer_size': 0,
+            'diagnostics': {
+                'mouse_listener': 'stopped',
+                'keyboard_listener': 'stopped'
+            }
+        }
+        # EWMA weights over the last K buffer intervals, newest first;
+        # precomputed once so each level read is a single dot product
+        self._ewma_window = 60
+        self._ewma_weights = np.exp(
+            -np.arange(self._ewma_window) / 20.0).astype(np.float32)
         
         # Thread safety
         self._lock = threading.Lock()
         self._mouse_listener = None
         self._keyboard_listener = None
         self._stop_event = threading.Event()
-        self._last_tick_time = time.time()
+        self._last_tick_mono = time.monotonic()
         
+    # The callbacks below run lock-free: each counter has exactly one
+    # writer (its own pynput listener thread), the float timestamp store
+    # is a single atomic bytecode under the GIL, and readers only take
+    # point-in-time snapshots - so a lock per keystroke bought nothing.
+    # Packing the counters into one 64-bit word would gain nothing over
+    # these already-atomic stores and caps clicks/presses at 2**20 -
+    # overflowable in a long session - so plain ints stay.
+
+    def _mark_activity(self):
+        """Record an input event: timestamp plus pushed-forward idle deadline"""
+        now = time.monotonic()
+        self._last_activity_mono = now
+        self._idle_deadline_mono = now + self.idle_threshold
+
     def _on_move(self, x, y):
         """Callback for mouse movement"""
-        with self._lock:
-            self.last_activity_time = datetime.now()
-        
+        self._mark_activity()
+
     def _on_click(self, x, y, button, pressed):
         """Callback for mouse click"""
         if pressed:
-            with self._lock:
-                self.mouse_clicks += 1
-                self.last_activity_time = datetime.now()
-    
+            self.mouse_clicks += 1
+            self._mark_activity()
+
     def _on_scroll(self, x, y, dx, dy):
         """Callback for mouse scroll"""
-        with self._lock:
-            self.last_activity_time = datetime.now()
-    
+        self._mark_activity()
+
     def _on_press(self, key):
         """Callback for keyboard press"""
-        try:
-            with self._lock:
-                self.keyboard_presses += 1
-                self.last_activity_time = datetime.now()
-        except AttributeError:
-            pass
+        # No attribute access on key (Key enums lack .char), so there is
+        # nothing here that can raise per press
+        self.keyboard_presses += 1
+        self._mark_activity()
     
     def start_monitoring(self):
         """Start monitoring user activity with thread safety"""
@@ -73,26 +137,39 @@ class ActivityMonitor:
                 return True
         
         logger.info("Starting activity monitoring...")
-        
+
         try:
             # Reset stop event
             self._stop_event.clear()
-            
-            # Set up mouse and keyboard listeners
-            self._mouse_listener = mouse.Listener(
-                on_move=self._on_move,
-                on_click=self._on_click,
-                on_scroll=self._on_scroll
-            )
-            self._mouse_listener.start()
-            
-            self._keyboard_listener = keyboard.Listener(on_press=self._on_press)
-            self._keyboard_listener.start()
-            
-            # Start monitoring thread
-            self.listener_thread = threading.Thread(target=self._monitor_loop, daemon=True)
-            self.listener_thread.start()
-            
+
+            # Headless deployments (no user at the console) can disable
+            # count capture and skip installing global OS hooks entirely
+            if ACTIVITY_CONFIG.get('capture_counts', True):
+                # Imported here rather than at module top: pynput pulls in
+                # the platform input backend, which callers that never
+                # start monitoring (setup scripts, analytics) shouldn't
+                # pay for
+                from pynput import mouse, keyboard
+
+                # Set up mouse and keyboard listeners. pynput runs one
+                # thread per device; collapsing both hooks onto a shared
+                # thread needs platform-specific backend surgery (or a
+                # Windows-only input library) for one idle thread saved,
+                # so two listeners stay
+                self._mouse_listener = mouse.Listener(
+                    on_move=self._on_move,
+                    on_click=self._on_click,
+                    on_scroll=self._on_scroll
+                )
+                self._mouse_listener.start()
+
+                self._keyboard_listener = keyboard.Listener(on_press=self._on_press)
+                self._keyboard_listener.start()
+
+            # No sampling thread: active/idle time accrues lazily in
+            # get_activity_summary, which the backend already polls
+            self._last_tick_mono = time.monotonic()
+
             with self._lock:
                 self.is_monitoring = True
             
@@ -140,93 +217,141 @@ class ActivityMonitor:
         except Exception as e:
             logger.warning(f"Error stopping keyboard listener: {e}")
         
-    def _monitor_loop(self):
-        """Main monitoring loop with stop event"""
-        while not self._stop_event.is_set():
-            try:
-                current_time = datetime.now()
-                now_ts = time.time()
-                elapsed = now_ts - self._last_tick_time
-                self._last_tick_time = now_ts
-                
-                with self._lock:
-                    time_since_activity = (current_time - self.last_activity_time).total_seconds()
-                    
-                    # Accumulate time based on activity
-                    if time_since_activity > self.idle_threshold:
-                        self.total_idle_seconds += elapsed
-                    else:
-                        self.total_active_seconds += elapsed
-                        
-                    mouse_clicks = self.mouse_clicks
-                    keyboard_presses = self.keyboard_presses
-                
-                activity_data = {
-                    'timestamp': current_time.isoformat(),
-                    'mouse_clicks': mouse_clicks,
-                    'keyboard_presses': keyboard_presses,
-                    'idle_time': time_since_activity,
-                    'is_idle': time_since_activity > self.idle_threshold,
-                    'screen_time': int(self.total_active_seconds)
-                }
-                
-                self.activity_buffer.append(activity_data)
-                logger.debug(f"Activity Tick: {mouse_clicks} clicks, {keyboard_presses} keys, Active: {int(self.total_active_seconds)}s")
-                
-                # Wait for the interval or stop event
-                self._stop_event.wait(self.monitor_interval)
-                
-            except Exception as e:
-                logger.error(f"Error in monitoring loop: {e}")
-                time.sleep(1)
-    
+    def _accrue_time(self, now_mono: float, is_idle: bool):
+        """Lazily accumulate active/idle time since the previous sample
+
+        Replaces the old 5s sampling thread: consumers poll
+        get_activity_summary anyway, so the elapsed interval is attributed
+        on demand instead of waking a thread to do it.
+        """
+        elapsed = now_mono - self._last_tick_mono
+        if elapsed <= 0:
+            # A caller that sampled the clock slightly later already
+            # accounted this interval while we waited for the lock
+            return
+        self._last_tick_mono = now_mono
+
+        if is_idle:
+            self.total_idle_seconds += elapsed
+        else:
+            self.total_active_seconds += elapsed
+
     def get_activity_summary(self) -> Dict:
-        """Get activity summary for the current period with thread safety"""
-        with self._lock:
-            # Use total active seconds as a basis for screen time
-            screen_time = int(self.total_active_seconds)
-            total_clicks = self.mouse_clicks
-            total_presses = self.keyboard_presses
-            time_since_activity = (datetime.now() - self.last_activity_time).total_seconds()
-            
-            # Diagnostics
-            mouse_status = "ok" if self._mouse_listener and self._mouse_listener.is_alive() else "stopped"
-            kb_status = "ok" if self._keyboard_listener and self._keyboard_listener.is_alive() else "stopped"
-            
-            return {
-                'mouse_clicks': total_clicks,
-                'keyboard_presses': total_presses,
-                'idle_time': int(time_since_activity),
-                'is_idle': time_since_activity > self.idle_threshold,
-                'activity_level': self._calculate_activity_level(total_clicks, total_presses),
-                'last_activity': self.last_activity_time.isoformat(),
-                'screen_time': screen_time,
-                'buffer_size': len(self.activity_buffer),
-                'diagnostics': {
-                    'mouse_listener': mouse_status,
-                    'keyboard_listener': kb_status
-                }
-            }
+        """Get activity summary for the current period
+
+        Counter reads are lock-free single atomic loads, and a summary is
+        a point-in-time snapshot anyway. The returned dict is reused
+        across calls - copy it before retaining it.
+        """
+        now_mono = time.monotonic()
+        expiry, cached = self._summary_cache
+        if cached is not None and now_mono < expiry:
+            return cached
+
+        total_clicks = self.mouse_clicks
+        total_presses = self.keyboard_presses
+        last_activity_mono = self._last_activity_mono
+        time_since_activity = now_mono - last_activity_mono
+        is_idle = now_mono > self._idle_deadline_mono
+
+        if self.is_monitoring:
+            # The rebuild path has many callers (request threads, the
+            # fatigue loop, the monitor loop) and read-modify-writes
+            # _last_tick_mono and _buf_idx: two concurrent rebuilds would
+            # double-count the elapsed interval and lose buffer samples.
+            # It runs at most ~once per half interval, so the lock is
+            # off the hot path.
+            with self._lock:
+                self._accrue_time(now_mono, is_idle)
+                slot = self._buf_idx % self._buf_size
+                self._buf_ts[slot] = int(time.time())
+                self._buf_clicks[slot] = total_clicks
+                self._buf_presses[slot] = total_presses
+                self._buf_idle[slot] = int(time_since_activity)
+                self._buf_screen[slot] = int(self.total_active_seconds)
+                self._buf_idx += 1
+
+        # Use total active seconds as a basis for screen time
+        screen_time = int(self.total_active_seconds)
+
+        # Diagnostics
+        mouse_status = "ok" if self._mouse_listener and self._mouse_listener.is_alive() else "stopped"
+        kb_status = "ok" if self._keyboard_listener and self._keyboard_listener.is_alive() else "stopped"
+
+        summary = self._summary_buf
+        summary['mouse_clicks'] = total_clicks
+        summary['keyboard_presses'] = total_presses
+        summary['idle_time'] = int(time_since_activity)
+        summary['is_idle'] = is_idle
+        summary['activity_level'] = self._rolling_activity_level(
+            total_clicks, total_presses, now_mono)
+        summary['last_activity'] = (self._start_wall + timedelta(
+            seconds=last_activity_mono - self._start_mono)).isoformat()
+        summary['screen_time'] = screen_time
+        summary['buffer_size'] = self._buf_idx
+        diagnostics = summary['diagnostics']
+        diagnostics['mouse_listener'] = mouse_status
+        diagnostics['keyboard_listener'] = kb_status
+        # Serve repeat callers (dashboard, AI analysis, analytics) from the
+        # same snapshot for half a monitor interval
+        self._summary_cache = (now_mono + self.monitor_interval * 0.5, summary)
+        return summary
     
-    def _calculate_activity_level(self, clicks: int, presses: int) -> float:
-        """Calculate activity level (0-1) based on actions per minute"""
-        total_actions = clicks + presses
-        uptime_minutes = (datetime.now() - self.start_time).total_seconds() / 60.0
-        
+    def _rolling_activity_level(self, clicks: int, presses: int,
+                                now_mono: float) -> float:
+        """Activity level (0-1) as an EWMA of recent action rates
+
+        The lifetime average barely moves after hours of uptime; this
+        weights the per-interval rates from the ring buffer so a typing
+        burst or a lull shows up within a few samples. One np.diff + dot
+        product, no Python loop; falls back to the lifetime rate until
+        the buffer has at least two samples.
+        """
+        window = self.snapshot(last=self._ewma_window + 1)
+        ts = window['timestamps']
+        if ts.size < 2:
+            return self._calculate_activity_level(clicks, presses, now_mono)
+
+        # Samples hold cumulative counts; clamp the diffs so a counter
+        # reset mid-window reads as zero activity, not a negative rate
+        actions = (window['clicks'] + window['presses']).astype(np.float64)
+        d_actions = np.maximum(np.diff(actions), 0.0)
+        d_t = np.maximum(np.diff(ts), 1).astype(np.float64)
+        rates = d_actions * 60.0 / d_t  # actions per minute, per interval
+
+        weights = self._ewma_weights[:rates.size][::-1]  # newest heaviest
+        level = float(rates @ weights) / float(weights.sum())
+        # Normalize: 50 actions per minute is considered 100% active
+        return min(1.0, level / 50.0)
+
+    def _calculate_activity_level(self, clicks: int, presses: int,
+                                  now_mono: float = None) -> float:
+        """Calculate activity level (0-1) based on actions per minute
+
+        Pure float arithmetic against the monotonic anchor - no datetime
+        objects allocated on this per-poll path.
+        """
+        if now_mono is None:
+            now_mono = time.monotonic()
+        uptime_minutes = (now_mono - self._start_mono) / 60.0
+
         if uptime_minutes < 0.1:  # Avoid division by zero
             return 0.0
-            
-        actions_per_minute = total_actions / uptime_minutes
+
+        actions_per_minute = (clicks + presses) / uptime_minutes
         # Normalize: 50 actions per minute is considered 100% active
-        activity_level = min(1.0, actions_per_minute / 50.0)
-        return activity_level
+        return min(1.0, actions_per_minute / 50.0)
     
     def reset_counters(self):
-        """Reset activity counters with thread safety"""
-        with self._lock:
-            self.mouse_clicks = 0
-            self.keyboard_presses = 0
-            self.last_activity_time = datetime.now()
+        """Reset activity counters
+
+        A concurrent event may slip in between the stores; losing one
+        count at reset time is harmless.
+        """
+        self.mouse_clicks = 0
+        self.keyboard_presses = 0
+        self._summary_cache = (0.0, None)
+        self._mark_activity()
     
     def _get_empty_summary(self) -> Dict:
         """Get empty activity summary"""
@@ -240,12 +365,51 @@ class ActivityMonitor:
             'buffer_size': 0
         }
     
+    def snapshot(self, last: int = None) -> Dict:
+        """Recent ring-buffer samples as parallel arrays, oldest first
+
+        Consumers aggregate with vectorized ufuncs (e.g.
+        snapshot(60)['clicks'].max()) instead of looping over per-sample
+        dicts. Returns copies, so a concurrent writer can't mutate rows
+        under the caller.
+        """
+        count = min(self._buf_idx, self._buf_size)
+        if last is not None:
+            count = min(count, last)
+        idx = np.arange(self._buf_idx - count, self._buf_idx) % self._buf_size
+        return {
+            'timestamps': self._buf_ts[idx],
+            'clicks': self._buf_clicks[idx],
+            'presses': self._buf_presses[idx],
+            'idle_time': self._buf_idle[idx],
+            'screen_time': self._buf_screen[idx],
+        }
+
+    def get_recent_clicks_per_min(self, window_seconds: int = 300) -> float:
+        """Click rate over ring-buffer samples in the recent window
+
+        Samples store cumulative counts, so the rate is the delta across
+        the window - computed with vectorized masking, no Python loop.
+        """
+        count = min(self._buf_idx, self._buf_size)
+        if count == 0:
+            return 0.0
+
+        ts = self._buf_ts[:count]
+        mask = ts >= int(time.time()) - window_seconds
+        if not mask.any():
+            return 0.0
+
+        clicks = self._buf_clicks[:count][mask]
+        span = max(float(ts[mask].max() - ts[mask].min()), 60.0)
+        return float(int(clicks.max()) - int(clicks.min())) * 60.0 / span
+
     def get_keystroke_dynamics(self) -> Dict:
         """Get keystroke dynamics for pattern analysis"""
         return {
             'total_keystrokes': self.keyboard_presses,
-            'keystroke_pattern': 'normal' if self.keyboard_presses > ACTIVITY_CONFIG['low_activity_threshold'] else 'low',
-            'timestamp': datetime.now().isoformat()
+            'keystroke_pattern': 'normal' if self.keyboard_presses > self.low_activity_threshold else 'low',
+            'timestamp': _iso_now()
         }
     
     def get_mouse_dynamics(self) -> Dict:
@@ -253,17 +417,11 @@ class ActivityMonitor:
         return {
             'total_clicks': self.mouse_clicks,
             'click_pattern': 'normal' if self.mouse_clicks > 10 else 'low',
-            'timestamp': datetime.now().isoformat()
+            'timestamp': _iso_now()
         }
 
 
-# Global instance
-activity_monitor = None
-
-
+@lru_cache(maxsize=1)
 def get_activity_monitor() -> ActivityMonitor:
-    """Get or create activity monitor instance"""
-    global activity_monitor
-    if activity_monitor is None:
-        activity_monitor = ActivityMonitor()
-    return activity_monitor
+    """Get or create activity monitor instance (idempotent singleton)"""
+    return ActivityMonitor()
@@ -3,12 +3,14 @@ Module 3: Break Enforcement (Force) Module
 Enforces breaks by locking screen, muting inputs, or fading screen
 """
 
+import heapq
 import logging
+import os
 import threading
 import time
-import pyautogui
 import ctypes
 from datetime import datetime
+from functools import lru_cache
 from typing import Dict, Optional
 from config.config import BREAK_CONFIG, NOTIFICATION_CONFIG
 import platform
@@ -24,11 +26,30 @@ class BreakEnforcer:
         self.is_enforcing = False
         self.enforcement_thread = None
         self.break_duration = BREAK_CONFIG['default_break_duration']
+        self.fade_duration = BREAK_CONFIG['screen_fade_duration']
+        # Alpha ramp computed once; a fade only reads it
+        self._alpha_ramp = tuple(i / 20 * 255 for i in range(20))
         self.break_type = 'micro'
         self.screen_locked = False
         self.input_muted = False
         self.start_time = None
         self.OS = platform.system()
+        # Interruptible wait: stop_enforcement sets this instead of the
+        # loop polling a flag once per second
+        self._stop_event = threading.Event()
+        # Created on first notification and reused; each ToastNotifier
+        # spins up its own Win32 message window
+        self._toaster = None
+        # One shared scheduler thread serving every scheduled break from
+        # a deadline-ordered heap, instead of a sleeping thread per
+        # schedule_break call
+        self._sched_heap = []  # (deadline_mono, duration_min, break_type)
+        self._sched_lock = threading.Lock()
+        self._sched_wake = threading.Event()
+        self._sched_thread = None
+        # Lazily opened session-bus connection (Linux); one DBus
+        # round-trip beats forking xdg-screensaver/notify-send shells
+        self._dbus_conn = None
         
     def enforce_break(self, duration: int, break_type: str = 'micro', 
                      lock_screen: bool = True, mute_input: bool = True) -> bool:
@@ -50,6 +71,7 @@ class BreakEnforcer:
         self.break_duration = duration
         self.break_type = break_type
         self.start_time = datetime.now()
+        self._stop_event.clear()
         
         # Start enforcement in separate thread
         self.enforcement_thread = threading.Thread(
@@ -65,32 +87,57 @@ class BreakEnforcer:
         """Stop enforcing break"""
         logger.info("Stopping break enforcement")
         self.is_enforcing = False
+        self._stop_event.set()
         self._restore_system_state()
         return True
-    
+
+    def _lower_thread_priority(self):
+        """Drop the calling thread's scheduling priority (best effort)
+
+        These background threads mostly sit in event waits; deprioritizing
+        them keeps their rare wakeups from pulling a parked core out of
+        deep sleep ahead of interactive work. os.nice is process-wide, so
+        Linux renices just the calling kernel task by native thread id.
+        """
+        try:
+            if self.OS == 'Windows':
+                THREAD_PRIORITY_BELOW_NORMAL = -1
+                handle = ctypes.windll.kernel32.GetCurrentThread()
+                ctypes.windll.kernel32.SetThreadPriority(
+                    handle, THREAD_PRIORITY_BELOW_NORMAL)
+            elif self.OS == 'Linux':
+                os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 10)
+        except Exception as e:
+            logger.debug(f"Could not lower thread priority: {e}")
+
     def _enforcement_loop(self, lock_screen: bool, mute_input: bool):
         """Main enforcement loop"""
         try:
+            self._lower_thread_priority()
+
             if lock_screen:
                 self._lock_screen()
-            
+
             if mute_input:
                 self._mute_input()
-            
-            # Keep enforcement active
-            elapsed = 0
-            while self.is_enforcing and elapsed < self.break_duration:
-                time.sleep(1)
-                elapsed += 1
-                
-                # Show remaining time if screen is locked
-                if lock_screen and elapsed % 10 == 0:
-                    remaining = self.break_duration - elapsed
+
+            # One interruptible wait per log line instead of a wake every
+            # second: the event fires immediately on stop_enforcement, and
+            # the deadline comes from a monotonic clock computed once
+            deadline = time.monotonic() + self.break_duration
+            while self.is_enforcing:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                if self._stop_event.wait(min(10.0, remaining)):
+                    break
+                if lock_screen:
+                    remaining = max(0, int(deadline - time.monotonic()))
                     logger.info(f"Break enforcement: {remaining} seconds remaining")
-            
+
             self._restore_system_state()
             self.is_enforcing = False
-            
+
         except Exception as e:
             logger.error(f"Error in enforcement loop: {e}")
             self._restore_system_state()
@@ -110,11 +157,13 @@ class BreakEnforcer:
                 self.screen_locked = True
                 
             elif self.OS == 'Linux':
-                # Try various Linux screen locker commands
-                try:
-                    subprocess.run(['xdg-screensaver', 'activate'])
-                except:
-                    subprocess.run(['gnome-screensaver-command', '-a'])
+                # DBus first; fall back to the screen locker commands
+                if not self._dbus_call('/org/freedesktop/ScreenSaver',
+                                       'org.freedesktop.ScreenSaver', 'Lock'):
+                    try:
+                        subprocess.run(['xdg-screensaver', 'activate'])
+                    except:
+                        subprocess.run(['gnome-screensaver-command', '-a'])
                 self.screen_locked = True
             
             logger.info("Screen locked successfully")
@@ -144,13 +193,14 @@ class BreakEnforcer:
         """Gradually fade the screen to black"""
         try:
             logger.info("Fading screen...")
-            fade_duration = BREAK_CONFIG['screen_fade_duration']
-            steps = 20
-            
-            for i in range(steps):
-                alpha = (i / steps) * 255
+            step = self.fade_duration / len(self._alpha_ramp)
+            start = time.perf_counter()
+
+            # Sleep to absolute deadlines so scheduler jitter doesn't
+            # accumulate and the fade lands on fade_duration overall
+            for i, alpha in enumerate(self._alpha_ramp, 1):
                 # Would need UI implementation to actually fade screen
-                time.sleep(fade_duration / steps)
+                time.sleep(max(0.0, start + i * step - time.perf_counter()))
             
         except Exception as e:
             logger.error(f"Error fading screen: {e}")
@@ -171,8 +221,12 @@ class BreakEnforcer:
             # Unlock screen
             if self.screen_locked:
                 if self.OS == 'Windows':
-                    # Press a key to wake screen
-                    pyautogui.press('space')
+                    # Synthesize a space press/release directly; pyautogui
+                    # did the same through PIL/Tk imports plus a 0.1s
+                    # PAUSE per keystroke
+                    VK_SPACE, KEYEVENTF_KEYUP = 0x20, 0x0002
+                    ctypes.windll.user32.keybd_event(VK_SPACE, 0, 0, 0)
+                    ctypes.windll.user32.keybd_event(VK_SPACE, 0, KEYEVENTF_KEYUP, 0)
                 self.screen_locked = False
             
             logger.info("System state restored")
@@ -195,10 +249,11 @@ class BreakEnforcer:
     def _show_windows_notification(self, title: str, message: str, duration: int):
         """Show Windows notification"""
         try:
-            from win10toast import ToastNotifier
-            toaster = ToastNotifier()
+            if self._toaster is None:
+                from win10toast import ToastNotifier
+                self._toaster = ToastNotifier()
             # Use threaded=True to prevent blocking the main thread
-            toaster.show_toast(title, message, duration=duration, threaded=True)
+            self._toaster.show_toast(title, message, duration=duration, threaded=True)
         except:
             logger.warning("Could not show Windows notification")
     
@@ -210,9 +265,37 @@ class BreakEnforcer:
         except:
             logger.warning("Could not show macOS notification")
     
+    def _dbus_call(self, path: str, bus_name: str, member: str,
+                   signature: str = None, body: tuple = ()) -> bool:
+        """Send one session-bus method call; False if DBus is unavailable
+
+        jeepney is pure Python and optional - when it isn't installed or
+        there is no session bus, callers fall back to their subprocess
+        path. The connection is opened once and reused.
+        """
+        try:
+            from jeepney import DBusAddress, new_method_call
+            from jeepney.io.blocking import open_dbus_connection
+
+            if self._dbus_conn is None:
+                self._dbus_conn = open_dbus_connection(bus='SESSION')
+            address = DBusAddress(path, bus_name=bus_name, interface=bus_name)
+            self._dbus_conn.send_and_get_reply(
+                new_method_call(address, member, signature, body))
+            return True
+        except Exception:
+            self._dbus_conn = None
+            return False
+
     def _show_linux_notification(self, title: str, message: str, duration: int):
         """Show Linux notification"""
         try:
+            if self._dbus_call(
+                    '/org/freedesktop/Notifications',
+                    'org.freedesktop.Notifications', 'Notify',
+                    'susssasa{sv}i',
+                    ('AI Micro Break', 0, '', title, message, [], {}, duration * 1000)):
+                return
             subprocess.run(['notify-send', title, message])
         except:
             logger.warning("Could not show Linux notification")
@@ -244,22 +327,38 @@ class BreakEnforcer:
     def schedule_break(self, break_interval: int, duration: int, break_type: str = 'micro'):
         """Schedule a break for later"""
         logger.info(f"Break scheduled: {break_type} break in {break_interval} minutes")
-        
-        def scheduled_break():
-            time.sleep(break_interval * 60)
-            self.enforce_break(duration * 60, break_type)
-        
-        thread = threading.Thread(target=scheduled_break, daemon=True)
-        thread.start()
 
+        deadline = time.monotonic() + break_interval * 60
+        with self._sched_lock:
+            heapq.heappush(self._sched_heap, (deadline, duration, break_type))
+            if self._sched_thread is None or not self._sched_thread.is_alive():
+                self._sched_thread = threading.Thread(
+                    target=self._scheduler_loop, daemon=True)
+                self._sched_thread.start()
+        # Wake the loop so it re-reads the earliest deadline
+        self._sched_wake.set()
+
+    def _scheduler_loop(self):
+        """Fire scheduled breaks from the heap, one wake per deadline"""
+        self._lower_thread_priority()
+        while True:
+            with self._sched_lock:
+                timeout = (self._sched_heap[0][0] - time.monotonic()
+                           if self._sched_heap else None)
 
-# Global instance
-break_enforcer = None
+            if timeout is None or timeout > 0:
+                # Sleeps until the earliest deadline, or until a new
+                # schedule arrives and possibly moves it forward
+                self._sched_wake.wait(timeout)
+                self._sched_wake.clear()
+                continue
+
+            with self._sched_lock:
+                _, duration, break_type = heapq.heappop(self._sched_heap)
+            self.enforce_break(duration * 60, break_type)
 
 
+@lru_cache(maxsize=1)
 def get_break_enforcer() -> BreakEnforcer:
-    """Get or create break enforcer instance"""
-    global break_enforcer
-    if break_enforcer is None:
-        break_enforcer = BreakEnforcer()
-    return break_enforcer
+    """Get or create break enforcer instance (idempotent singleton)"""
+    return BreakEnforcer()
@@ -3,8 +3,13 @@ Module 4: AI-Powered Break Recommendation Module (Enhanced)
 Generates highly personalized break activities using Groq AI
 """
 
+import bisect
 import logging
 import random
+import threading
+import time
+from collections import deque
+from functools import lru_cache
 from datetime import datetime
 from typing import List, Dict, Optional
 from config.config import RECOMMENDATION_CONFIG, ML_CONFIG
@@ -12,18 +17,204 @@ from modules.groq_ai_integration import get_groq_ai
 
 logger = logging.getLogger(__name__)
 
+# Curated wellness activities for the fallback path, built once at
+# import instead of per call
+_ACTIVITIES_DB = (
+    {
+        'activity': '20-20-20 Eye Exercise',
+        'category': 'eye_exercise',
+        'reason': 'Reduces digital eye strain and refocuses vision',
+        'duration_min': 1,
+        'duration_max': 2,
+        'benefits': 'Prevents eye fatigue and improves focus',
+        'steps': '1. Look away from screen\n2. Find object 20 feet away\n3. Focus on it for 20 seconds\n4. Blink naturally',
+        'intensity': 'Low',
+        'effectiveness': 85,
+        'for_fatigue': ['low', 'moderate']
+    },
+    {
+        'activity': 'Neck and Shoulder Stretch',
+        'category': 'stretching',
+        'reason': 'Relieves tension from prolonged typing',
+        'duration_min': 2,
+        'duration_max': 3,
+        'benefits': 'Improves flexibility and reduces muscle tension',
+        'steps': '1. Rotate neck slowly 10 times each direction\n2. Shrug shoulders 10 times\n3. Stretch neck to each side gently',
+        'intensity': 'Low',
+        'effectiveness': 80,
+        'for_fatigue': ['low', 'moderate', 'high']
+    },
+    {
+        'activity': '4-7-8 Breathing Exercise',
+        'category': 'breathing',
+        'reason': 'Calms mind and reduces stress',
+        'duration_min': 3,
+        'duration_max': 5,
+        'benefits': 'Promotes relaxation and mental clarity',
+        'steps': '1. Sit comfortably\n2. Inhale for 4 counts\n3. Hold for 7 counts\n4. Exhale for 8 counts\n5. Repeat 4 times',
+        'intensity': 'Low',
+        'effectiveness': 90,
+        'for_fatigue': ['high', 'critical']
+    },
+    {
+        'activity': 'Hydration Break',
+        'category': 'hydration',
+        'reason': 'Maintains hydration and encourages movement',
+        'duration_min': 2,
+        'duration_max': 3,
+        'benefits': 'Improves focus and cognitive function',
+        'steps': '1. Stand up\n2. Walk to water source\n3. Drink water slowly\n4. Return to desk',
+        'intensity': 'Low',
+        'effectiveness': 75,
+        'for_fatigue': ['moderate', 'high']
+    },
+    {
+        'activity': 'Posture Correction Stretch',
+        'category': 'posture',
+        'reason': 'Corrects slouching and improves alignment',
+        'duration_min': 2,
+        'duration_max': 4,
+        'benefits': 'Reduces back pain and improves breathing',
+        'steps': '1. Stand up straight\n2. Stretch arms above head\n3. Bend backward gently for 10 seconds\n4. Roll shoulders backward 5 times',
+        'intensity': 'Low',
+        'effectiveness': 80,
+        'for_fatigue': ['moderate', 'high']
+    },
+    {
+        'activity': 'Mindfulness Meditation',
+        'category': 'meditation',
+        'reason': 'Resets mental focus and reduces stress',
+        'duration_min': 3,
+        'duration_max': 5,
+        'benefits': 'Enhances mental clarity and emotional regulation',
+        'steps': '1. Close eyes\n2. Focus on breathing\n3. Notice sensations without judgment\n4. Gently bring attention back to breath',
+        'intensity': 'Low',
+        'effectiveness': 88,
+        'for_fatigue': ['high', 'critical']
+    },
+    {
+        'activity': 'Short Walk',
+        'category': 'walking',
+        'reason': 'Improves circulation and provides mental break',
+        'duration_min': 5,
+        'duration_max': 10,
+        'benefits': 'Increases energy and resets mental state',
+        'steps': '1. Stand up\n2. Walk around office/home\n3. Change scenery if possible\n4. Return refreshed',
+        'intensity': 'Moderate',
+        'effectiveness': 92,
+        'for_fatigue': ['high', 'critical']
+    },
+    {
+        'activity': 'Wrist and Hand Stretch',
+        'category': 'stretching',
+        'reason': 'Prevents carpal tunnel and hand strain',
+        'duration_min': 2,
+        'duration_max': 3,
+        'benefits': 'Improves hand dexterity and reduces pain',
+        'steps': '1. Extend one arm\n2. Gently pull fingers backward\n3. Hold 15 seconds\n4. Repeat other hand',
+        'intensity': 'Low',
+        'effectiveness': 78,
+        'for_fatigue': ['low', 'moderate']
+    },
+    {
+        'activity': 'Face Massage',
+        'category': 'relaxation',
+        'reason': 'Improves facial blood flow and reduces tension',
+        'duration_min': 2,
+        'duration_max': 3,
+        'benefits': 'Reduces facial tension and promotes relaxation',
+        'steps': '1. Gently massage temples\n2. Massage jawline\n3. Massage forehead\n4. Relax face',
+        'intensity': 'Low',
+        'effectiveness': 75,
+        'for_fatigue': ['moderate', 'high']
+    },
+    {
+        'activity': 'Desk Yoga',
+        'category': 'yoga',
+        'reason': 'Builds strength and flexibility at desk',
+        'duration_min': 5,
+        'duration_max': 8,
+        'benefits': 'Improves flexibility and reduces stress',
+        'steps': '1. Seated cat-cow stretch\n2. Spinal twist\n3. Shoulder roll\n4. Finish with breathing',
+        'intensity': 'Moderate',
+        'effectiveness': 85,
+        'for_fatigue': ['moderate', 'high']
+    }
+)
+
+# Inverted indices over _ACTIVITIES_DB, built once at import: fatigue
+# level -> activity indices, plus duration_max sorted for bisect so the
+# time filter is a slice instead of a scan
+_BY_FATIGUE = {}
+for _i, _a in enumerate(_ACTIVITIES_DB):
+    for _level in _a['for_fatigue']:
+        _BY_FATIGUE.setdefault(_level, set()).add(_i)
+_BY_FATIGUE = {k: frozenset(v) for k, v in _BY_FATIGUE.items()}
+_BY_DURATION = sorted((a['duration_max'], i) for i, a in enumerate(_ACTIVITIES_DB))
+_DURATION_MAXES = [d for d, _ in _BY_DURATION]
+
+# Groq response keys -> response-payload keys, with the defaults used
+# when the model omits a field
+_REC_KEY_MAP = {
+    'ACTIVITY': 'activity',
+    'REASON': 'reason',
+    'DURATION_MIN': 'duration_min',
+    'DURATION_MAX': 'duration_max',
+    'BENEFITS': 'benefits',
+    'STEPS': 'steps',
+    'INTENSITY': 'intensity',
+    'EFFECTIVENESS_SCORE': 'effectiveness',
+}
+_REC_DEFAULTS = {
+    'activity': 'Take a break',
+    'reason': '',
+    'duration_min': 3,
+    'duration_max': 5,
+    'benefits': '',
+    'steps': '',
+    'intensity': 'Low',
+    'effectiveness': 75,
+}
+
 
 class BreakRecommender:
     """Recommends personalized break activities using AI"""
     
     def __init__(self):
         self.use_ai = ML_CONFIG.get('enable_ai_recommendations', True)
-        self.groq_ai = get_groq_ai() if self.use_ai else None
+        # Groq client construction is deferred to the first AI call so a
+        # recommender that only ever serves fallbacks (offline, no API
+        # key) never builds an HTTP client
+        self._groq_ai = None
+        self._groq_initialized = False
         self.user_preferences = {}
-        self.recommendation_history = []
         self.max_history = 20
+        # maxlen evicts the oldest entry on append; list.pop(0) shifted
+        # the whole history every time it filled
+        self.recommendation_history = deque(maxlen=self.max_history)
+        # Names of the last few recommendations, maintained alongside the
+        # history so the avoid-repetition read is a straight copy instead
+        # of a per-call comprehension over history dicts
+        self._recent_activities = deque(maxlen=5)
+        # In-flight Groq calls keyed by request shape, so concurrent
+        # identical requests share one round-trip
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+        # Completed AI recommendations by request shape: {key: (expiry,
+        # result)}. An equivalent request within the TTL skips the HTTP
+        # round-trip entirely
+        self._rec_cache = {}
+        self._rec_ttl = 300.0
         self.rotation_strategy = RECOMMENDATION_CONFIG.get('rotation_strategy', 'weighted_random')
-    
+
+    @property
+    def groq_ai(self):
+        """Groq integration, constructed on first access"""
+        if not self._groq_initialized:
+            self._groq_ai = get_groq_ai() if self.use_ai else None
+            self._groq_initialized = True
+        return self._groq_ai
+
     def get_recommendation(self, user_id: int, current_state: Dict) -> Dict:
         """
         Get AI-powered personalized break recommendation
@@ -37,41 +228,54 @@ class BreakRecommender:
         """
         try:
             # Get recent history to avoid repetition
-            recent_activities = [r['activity'] for r in self.recommendation_history[-5:]]
+            recent_activities = list(self._recent_activities)
             
             # Use Groq AI for recommendation
             if self.use_ai and self.groq_ai and self.groq_ai.client:
+                # An equivalent request (same user, fatigue, time budget
+                # and recent-activity window) within the TTL reuses the
+                # last AI answer with a fresh timestamp
+                cache_key = (user_id,
+                             current_state.get('fatigue_level'),
+                             current_state.get('available_time'),
+                             tuple(recent_activities))
+                expiry, cached = self._rec_cache.get(cache_key, (0.0, None))
+                if cached is not None and time.monotonic() < expiry:
+                    cached = dict(cached)
+                    cached['timestamp'] = datetime.now().isoformat()
+                    return cached
+
                 logger.info(f"Generating AI-powered recommendation for user {user_id}...")
-                
-                recommendation = self.groq_ai.generate_personalized_recommendation(
-                    user_id=user_id,
-                    current_state=current_state,
-                    history=recent_activities
-                )
-                
+
+                recommendation = self._call_groq(
+                    user_id, current_state, recent_activities)
+
                 if recommendation.get('status') == 'success':
+                    # One datetime/ISO string per call, shared by the
+                    # history entry and the returned dict
+                    now_iso = datetime.now().isoformat()
                     # Add to history
                     self.recommendation_history.append({
-                        'timestamp': datetime.now().isoformat(),
+                        'timestamp': now_iso,
                         'activity': recommendation.get('ACTIVITY', 'Unknown'),
                         'user_id': user_id
                     })
-                    if len(self.recommendation_history) > self.max_history:
-                        self.recommendation_history.pop(0)
-                    
-                    return {
-                        'status': 'success',
-                        'user_id': user_id,
-                        'activity': recommendation.get('ACTIVITY', 'Take a break'),
-                        'reason': recommendation.get('REASON', ''),
-                        'duration_min': recommendation.get('DURATION_MIN', 3),
-                        'duration_max': recommendation.get('DURATION_MAX', 5),
-                        'benefits': recommendation.get('BENEFITS', ''),
-                        'steps': recommendation.get('STEPS', ''),
-                        'intensity': recommendation.get('INTENSITY', 'Low'),
-                        'effectiveness': recommendation.get('EFFECTIVENESS_SCORE', 75),
-                        'timestamp': datetime.now().isoformat()
-                    }
+                    self._recent_activities.append(
+                        recommendation.get('ACTIVITY', 'Unknown'))
+
+                    result = dict(_REC_DEFAULTS)
+                    for groq_key, out_key in _REC_KEY_MAP.items():
+                        if groq_key in recommendation:
+                            result[out_key] = recommendation[groq_key]
+                    result.update(status='success', user_id=user_id,
+                                  timestamp=now_iso)
+                    if len(self._rec_cache) > 256:
+                        now = time.monotonic()
+                        self._rec_cache = {k: v for k, v in self._rec_cache.items()
+                                           if v[0] > now}
+                    self._rec_cache[cache_key] = (
+                        time.monotonic() + self._rec_ttl, result)
+                    return result
             
             # Fallback to standard recommendations if AI unavailable
             logger.info("Using fallback recommendation system...")
@@ -81,6 +285,39 @@ class BreakRecommender:
             logger.error(f"Error getting recommendation: {e}")
             return self._get_fallback_recommendation(user_id, current_state, [])
 
+    def _call_groq(self, user_id: int, current_state: Dict, recent: List[str]) -> Dict:
+        """Single-flight wrapper around the Groq recommendation call
+
+        When several threads (dashboard refresh plus a scheduled check)
+        ask for the same user/state at once, the first becomes the leader
+        and makes the HTTP call; the rest wait on its event and share the
+        response instead of issuing duplicate round-trips.
+        """
+        key = (user_id, current_state.get('fatigue_level'),
+               current_state.get('available_time'))
+        with self._inflight_lock:
+            entry = self._inflight.get(key)
+            leader = entry is None
+            if leader:
+                entry = [threading.Event(), None]
+                self._inflight[key] = entry
+
+        if not leader:
+            entry[0].wait(timeout=15)
+            return entry[1] or {}
+
+        try:
+            entry[1] = self.groq_ai.generate_personalized_recommendation(
+                user_id=user_id,
+                current_state=current_state,
+                history=recent
+            )
+            return entry[1]
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+            entry[0].set()
+
     def get_recommendations(self, fatigue_status: Dict, activity_summary: Dict, user_id: int, count: int = 2) -> List[Dict]:
         """
         Get multiple personalized break recommendations
@@ -106,6 +343,7 @@ class BreakRecommender:
             recommendations.append(rec)
             # Temporarily add to history to prevent duplicate in the same set
             self.recommendation_history.append({'activity': rec.get('activity')})
+            self._recent_activities.append(rec.get('activity'))
             
         return recommendations
     
@@ -113,148 +351,35 @@ class BreakRecommender:
         """Get fallback recommendation from predefined list"""
         fatigue_level = current_state.get('fatigue_level', 'medium')
         available_time = current_state.get('available_time', 5)
-        
-        # Curated wellness activities
-        activities_db = [
-            {
-                'activity': '20-20-20 Eye Exercise',
-                'category': 'eye_exercise',
-                'reason': 'Reduces digital eye strain and refocuses vision',
-                'duration_min': 1,
-                'duration_max': 2,
-                'benefits': 'Prevents eye fatigue and improves focus',
-                'steps': '1. Look away from screen\n2. Find object 20 feet away\n3. Focus on it for 20 seconds\n4. Blink naturally',
-                'intensity': 'Low',
-                'effectiveness': 85,
-                'for_fatigue': ['low', 'moderate']
-            },
-            {
-                'activity': 'Neck and Shoulder Stretch',
-                'category': 'stretching',
-                'reason': 'Relieves tension from prolonged typing',
-                'duration_min': 2,
-                'duration_max': 3,
-                'benefits': 'Improves flexibility and reduces muscle tension',
-                'steps': '1. Rotate neck slowly 10 times each direction\n2. Shrug shoulders 10 times\n3. Stretch neck to each side gently',
-                'intensity': 'Low',
-                'effectiveness': 80,
-                'for_fatigue': ['low', 'moderate', 'high']
-            },
-            {
-                'activity': '4-7-8 Breathing Exercise',
-                'category': 'breathing',
-                'reason': 'Calms mind and reduces stress',
-                'duration_min': 3,
-                'duration_max': 5,
-                'benefits': 'Promotes relaxation and mental clarity',
-                'steps': '1. Sit comfortably\n2. Inhale for 4 counts\n3. Hold for 7 counts\n4. Exhale for 8 counts\n5. Repeat 4 times',
-                'intensity': 'Low',
-                'effectiveness': 90,
-                'for_fatigue': ['high', 'critical']
-            },
-            {
-                'activity': 'Hydration Break',
-                'category': 'hydration',
-                'reason': 'Maintains hydration and encourages movement',
-                'duration_min': 2,
-                'duration_max': 3,
-                'benefits': 'Improves focus and cognitive function',
-                'steps': '1. Stand up\n2. Walk to water source\n3. Drink water slowly\n4. Return to desk',
-                'intensity': 'Low',
-                'effectiveness': 75,
-                'for_fatigue': ['moderate', 'high']
-            },
-            {
-                'activity': 'Posture Correction Stretch',
-                'category': 'posture',
-                'reason': 'Corrects slouching and improves alignment',
-                'duration_min': 2,
-                'duration_max': 4,
-                'benefits': 'Reduces back pain and improves breathing',
-                'steps': '1. Stand up straight\n2. Stretch arms above head\n3. Bend backward gently for 10 seconds\n4. Roll shoulders backward 5 times',
-                'intensity': 'Low',
-                'effectiveness': 80,
-                'for_fatigue': ['moderate', 'high']
-            },
-            {
-                'activity': 'Mindfulness Meditation',
-                'category': 'meditation',
-                'reason': 'Resets mental focus and reduces stress',
-                'duration_min': 3,
-                'duration_max': 5,
-                'benefits': 'Enhances mental clarity and emotional regulation',
-                'steps': '1. Close eyes\n2. Focus on breathing\n3. Notice sensations without judgment\n4. Gently bring attention back to breath',
-                'intensity': 'Low',
-                'effectiveness': 88,
-                'for_fatigue': ['high', 'critical']
-            },
-            {
-                'activity': 'Short Walk',
-                'category': 'walking',
-                'reason': 'Improves circulation and provides mental break',
-                'duration_min': 5,
-                'duration_max': 10,
-                'benefits': 'Increases energy and resets mental state',
-                'steps': '1. Stand up\n2. Walk around office/home\n3. Change scenery if possible\n4. Return refreshed',
-                'intensity': 'Moderate',
-                'effectiveness': 92,
-                'for_fatigue': ['high', 'critical']
-            },
-            {
-                'activity': 'Wrist and Hand Stretch',
-                'category': 'stretching',
-                'reason': 'Prevents carpal tunnel and hand strain',
-                'duration_min': 2,
-                'duration_max': 3,
-                'benefits': 'Improves hand dexterity and reduces pain',
-                'steps': '1. Extend one arm\n2. Gently pull fingers backward\n3. Hold 15 seconds\n4. Repeat other hand',
-                'intensity': 'Low',
-                'effectiveness': 78,
-                'for_fatigue': ['low', 'moderate']
-            },
-            {
-                'activity': 'Face Massage',
-                'category': 'relaxation',
-                'reason': 'Improves facial blood flow and reduces tension',
-                'duration_min': 2,
-                'duration_max': 3,
-                'benefits': 'Reduces facial tension and promotes relaxation',
-                'steps': '1. Gently massage temples\n2. Massage jawline\n3. Massage forehead\n4. Relax face',
-                'intensity': 'Low',
-                'effectiveness': 75,
-                'for_fatigue': ['moderate', 'high']
-            },
-            {
-                'activity': 'Desk Yoga',
-                'category': 'yoga',
-                'reason': 'Builds strength and flexibility at desk',
-                'duration_min': 5,
-                'duration_max': 8,
-                'benefits': 'Improves flexibility and reduces stress',
-                'steps': '1. Seated cat-cow stretch\n2. Spinal twist\n3. Shoulder roll\n4. Finish with breathing',
-                'intensity': 'Moderate',
-                'effectiveness': 85,
-                'for_fatigue': ['moderate', 'high']
-            }
-        ]
-        
-        # Filter by available time
-        suitable = [a for a in activities_db if a['duration_max'] <= available_time]
-        
-        # Filter by fatigue level
-        if suitable:
-            suitable = [a for a in suitable if fatigue_level in a['for_fatigue']]
-        
+
+        # Filter by available time: bisect on the sorted duration maxima
+        # gives the fitting indices as a slice
+        cut = bisect.bisect_right(_DURATION_MAXES, available_time)
+        candidates = {i for _, i in _BY_DURATION[:cut]}
+
+        # Filter by fatigue level via the precomputed index
+        if candidates:
+            candidates &= _BY_FATIGUE.get(fatigue_level, frozenset())
+
         # Rotate to avoid repetition
-        if not suitable:
-            suitable = activities_db
+        if candidates:
+            suitable = [_ACTIVITIES_DB[i] for i in sorted(candidates)]
+        else:
+            suitable = list(_ACTIVITIES_DB)
         
-        # Avoid recent activities
+        # One-pass weighted reservoir pick (A-Res keys: rand**(1/weight))
+        # biased toward effectiveness, skipping recent activities - the
+        # old first-not-recent scan always favored the table order
+        recent_set = frozenset(recent)
+        rec, best_key = None, -1.0
         for activity in suitable:
-            if activity['activity'] not in recent:
-                rec = activity
-                break
-        else:
+            if activity['activity'] in recent_set:
+                continue
+            key = random.random() ** (1.0 / activity['effectiveness'])
+            if key > best_key:
+                best_key, rec = key, activity
+        if rec is None:
+            # Everything suitable was recent; repetition beats nothing
             rec = random.choice(suitable)
         
         return {
@@ -302,6 +427,81 @@ class BreakRecommender:
             logger.error(f"Error getting schedule: {e}")
             return self._get_fallback_schedule()
     
+    def get_session_bundle(self, user_id: int, current_state: Dict,
+                           work_history: List[Dict], preferences: Dict) -> Dict:
+        """
+        Get a recommendation and an adaptive schedule in one Groq call
+
+        Session startup wants both; calling get_recommendation and
+        get_adaptive_schedule separately costs two HTTP round-trips for
+        prompts built from the same context. The combined call halves
+        that; either half falling through still serves its fallback.
+
+        Returns:
+            Dict with 'recommendation' and 'schedule' entries, each in the
+            same shape the individual methods return
+        """
+        try:
+            recent_activities = list(self._recent_activities)
+
+            if self.use_ai and self.groq_ai and self.groq_ai.client:
+                logger.info(f"Generating combined session bundle for user {user_id}...")
+
+                bundle = self.groq_ai.generate_combined_session(
+                    user_id=user_id,
+                    current_state=current_state,
+                    history=recent_activities,
+                    work_history=work_history,
+                    user_preferences=preferences
+                )
+
+                if bundle.get('status') == 'success':
+                    now_iso = datetime.now().isoformat()
+                    raw_rec = bundle['recommendation']
+                    self.recommendation_history.append({
+                        'timestamp': now_iso,
+                        'activity': raw_rec.get('ACTIVITY', 'Unknown'),
+                        'user_id': user_id
+                    })
+                    self._recent_activities.append(
+                        raw_rec.get('ACTIVITY', 'Unknown'))
+
+                    recommendation = dict(_REC_DEFAULTS)
+                    for groq_key, out_key in _REC_KEY_MAP.items():
+                        if groq_key in raw_rec:
+                            recommendation[out_key] = raw_rec[groq_key]
+                    recommendation.update(status='success', user_id=user_id,
+                                          timestamp=now_iso)
+
+                    raw_sched = bundle['schedule']
+                    schedule = {
+                        'status': 'success',
+                        'user_id': user_id,
+                        'next_break_in': raw_sched.get('NEXT_BREAK_IN', 20),
+                        'optimal_intervals': raw_sched.get('OPTIMAL_INTERVALS', [20, 25, 30]),
+                        'break_types': raw_sched.get('BREAK_TYPES', ['Micro', 'Standard']),
+                        'flexibility_score': raw_sched.get('FLEXIBILITY_SCORE', 0.7),
+                        'reasoning': raw_sched.get('REASONING', ''),
+                        'timestamp': now_iso
+                    }
+                    return {'recommendation': recommendation, 'schedule': schedule}
+
+            # AI unavailable: both fallbacks are local, so there is no
+            # round-trip left to save
+            return {
+                'recommendation': self._get_fallback_recommendation(
+                    user_id, current_state, recent_activities),
+                'schedule': self._get_fallback_schedule()
+            }
+
+        except Exception as e:
+            logger.error(f"Error getting session bundle: {e}")
+            return {
+                'recommendation': self._get_fallback_recommendation(
+                    user_id, current_state, []),
+                'schedule': self._get_fallback_schedule()
+            }
+
     def _get_fallback_schedule(self) -> Dict:
         """Get default break schedule"""
         return {
@@ -314,13 +514,7 @@ class BreakRecommender:
         }
 
 
-# Global instance
-break_recommender = None
-
-
+@lru_cache(maxsize=1)
 def get_break_recommender() -> BreakRecommender:
-    """Get or create break recommender instance"""
-    global break_recommender
-    if break_recommender is None:
-        break_recommender = BreakRecommender()
-    return break_recommender
+    """Get or create break recommender instance (idempotent singleton)"""
+    return BreakRecommender()
@@ -11,11 +11,30 @@ from typing import Dict, Tuple, Optional, List
 from config.config import FATIGUE_CONFIG, ML_CONFIG
 import threading
 import time
+from functools import lru_cache
 from modules.groq_ai_integration import get_groq_ai
 from modules.activity_monitor import get_activity_monitor
 
 logger = logging.getLogger(__name__)
 
+# Recommendation tiers keyed by minimum fatigue score, highest first.
+# Hoisted to module level so the hot path scans thresholds instead of
+# rebuilding these lists on every call.
+_RECOMMENDATION_TIERS = (
+    (0.8, (
+        {'activity': 'Short Walk', 'duration': 10, 'reason': 'High fatigue detected'},
+        {'activity': 'Power Nap', 'duration': 15, 'reason': 'Critical fatigue level'}
+    )),
+    (0.6, (
+        {'activity': 'Stretching', 'duration': 5, 'reason': 'Moderate fatigue detected'},
+        {'activity': 'Deep Breathing', 'duration': 3, 'reason': 'Refocusing needed'}
+    )),
+    (-1.0, (
+        {'activity': 'Eye Exercise', 'duration': 1, 'reason': 'Preventative maintenance'},
+        {'activity': 'Hydration', 'duration': 2, 'reason': 'Keep energy levels up'}
+    )),
+)
+
 
 class FatigueDetector:
     """Detects user fatigue using AI and optional computer vision with thread safety"""
@@ -429,26 +448,15 @@ class FatigueDetector:
 
     def get_recommendations_for_fatigue(self) -> List[Dict]:
         """Get break recommendations based on current fatigue level"""
-        status = self.get_fatigue_status()
-        fatigue_score = status.get('fatigue_score', 0)
-        
-        recs = []
-        if fatigue_score > 0.8:
-            recs = [
-                {'activity': 'Short Walk', 'duration': 10, 'reason': 'High fatigue detected'},
-                {'activity': 'Power Nap', 'duration': 15, 'reason': 'Critical fatigue level'}
-            ]
-        elif fatigue_score > 0.6:
-            recs = [
-                {'activity': 'Stretching', 'duration': 5, 'reason': 'Moderate fatigue detected'},
-                {'activity': 'Deep Breathing', 'duration': 3, 'reason': 'Refocusing needed'}
-            ]
-        else:
-            recs = [
-                {'activity': 'Eye Exercise', 'duration': 1, 'reason': 'Preventative maintenance'},
-                {'activity': 'Hydration', 'duration': 2, 'reason': 'Keep energy levels up'}
-            ]
-        return recs
+        # Only the score is needed here - skip building the full status dict
+        with self._lock:
+            fatigue_score = self.current_fatigue_score
+
+        for threshold, recs in _RECOMMENDATION_TIERS:
+            if fatigue_score > threshold:
+                # Return copies so callers can't mutate the shared tiers
+                return [dict(r) for r in recs]
+        return []
 
     def reset_metrics(self):
         """Reset fatigue metrics (e.g., after a break)"""
@@ -458,13 +466,7 @@ class FatigueDetector:
         logger.info("[OK] Fatigue metrics reset after break")
 
 
-# Global instance
-fatigue_detector = None
-
-
+@lru_cache(maxsize=1)
 def get_fatigue_detector() -> FatigueDetector:
-    """Get or create fatigue detector instance"""
-    global fatigue_detector
-    if fatigue_detector is None:
-        fatigue_detector = FatigueDetector()
-    return fatigue_detector
+    """Get or create fatigue detector instance (idempotent singleton)"""
+    return FatigueDetector()
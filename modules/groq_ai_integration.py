@@ -230,6 +230,96 @@ Provide JSON with:
             logger.error(f"Groq recommendation failed: {e}")
             return self._fallback_recommendation(current_state)
     
+    def generate_combined_session(self, user_id: int, current_state: Dict, history: List[str],
+                                  work_history: List[Dict], user_preferences: Dict) -> Dict:
+        """
+        Generate a break recommendation and an adaptive schedule in one call
+
+        Session startup needs both; fusing them into a single prompt costs
+        one HTTP round-trip instead of two.
+
+        Args:
+            user_id: User identifier
+            current_state: Current user state (fatigue, time available, etc.)
+            history: Recent break activity history
+            work_history: Recent work session data
+            user_preferences: User's break preferences
+
+        Returns:
+            Dict with 'recommendation' and 'schedule' entries
+        """
+        try:
+            if not self.client:
+                return {
+                    'status': 'fallback',
+                    'recommendation': self._fallback_recommendation(current_state),
+                    'schedule': self._fallback_break_schedule()
+                }
+
+            recent_activities = ", ".join(history[-5:]) if history else "None yet"
+            history_summary = self._summarize_work_history(work_history)
+
+            prompt = f"""You are a wellness expert. Produce BOTH a break activity recommendation and an adaptive break schedule.
+
+CURRENT STATE:
+- Fatigue level: {current_state.get('fatigue_level', 'medium')}
+- Time available: {current_state.get('available_time', 5)} minutes
+- Previous activities (today): {recent_activities}
+
+USER WORK PATTERNS:
+{history_summary}
+
+USER PREFERENCES:
+- Preferred break types: {', '.join(user_preferences.get('preferred_types', ['general']))}
+- Max break duration: {user_preferences.get('max_duration', 10)} minutes
+
+Provide one JSON object with exactly two keys:
+- RECOMMENDATION: {{ACTIVITY, REASON, DURATION_MIN, DURATION_MAX, BENEFITS, STEPS, INTENSITY, EFFECTIVENESS_SCORE}}
+- SCHEDULE: {{NEXT_BREAK_IN, OPTIMAL_INTERVALS, BREAK_TYPES, REASONING, FLEXIBILITY_SCORE}}"""
+
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.4,
+                max_tokens=900
+            )
+
+            combined_text = response.choices[0].message.content
+            result = self._parse_json_response(combined_text)
+
+            recommendation = result.get('RECOMMENDATION')
+            schedule = result.get('SCHEDULE')
+            if not isinstance(recommendation, dict) or not isinstance(schedule, dict):
+                # Malformed split; let callers fall back rather than
+                # guessing which half is usable
+                raise ValueError("combined response missing RECOMMENDATION/SCHEDULE")
+
+            timestamp = datetime.now().isoformat()
+            return {
+                'status': 'success',
+                'recommendation': {
+                    'status': 'success',
+                    'user_id': user_id,
+                    'timestamp': timestamp,
+                    **recommendation
+                },
+                'schedule': {
+                    'status': 'success',
+                    'user_id': user_id,
+                    'timestamp': timestamp,
+                    **schedule
+                }
+            }
+        except Exception as e:
+            logger.error(f"Groq combined session generation failed: {e}")
+            return {
+                'status': 'fallback',
+                'recommendation': self._fallback_recommendation(current_state),
+                'schedule': self._fallback_break_schedule()
+            }
+
     def analyze_compliance_and_adapt(self, user_id: int, compliance_data: Dict, performance_data: Dict) -> Dict:
         """
         Analyze user compliance and suggest adaptations